@@ -2,245 +2,67 @@
 NORMALISED UNIVERSITY MANAGEMENT SYSTEM
 ========================================
 Python + Flask + SQLite
-schema.sql ki zaroorat NAHI - sab kuch yahan hai
+schema.sql ki zaroorat NAHI - tables storage.py (Database.init_db) banata hai
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
-import sqlite3
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g
+from flask import Response, stream_with_context
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
-import hashlib
+import time
 from functools import wraps
 from datetime import datetime
 
+from cdc import fetch_changes, compact_changes
+from assets import init_assets, is_production
+from storage import Database, hash_password
+from auth import UserCache, make_session_store, role_allowed, has_permission
+from scheduler import TimetableCache, valid_academic_year, DAYS, PERIODS
+from shared import SharedCache, LocalCache, WriterLock
+from profiler import init_profiler
+from marksheets import KINDS, course_info, html_chunks, pdf_chunks
+from ratelimit import WriteGate, limiter_from_env, rate_limit, write_admission
+
 # ──────────────────────────────────────────────
 # APP CONFIGURATION
 # ──────────────────────────────────────────────
-app = Flask(__name__)
+_startup = time.perf_counter()
+app = Flask(__name__, static_folder=None)
 app.secret_key = 'university_secret_key_2024'
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH  = os.path.join(BASE_DIR, 'database', 'university.db')
-
-
-# ──────────────────────────────────────────────
-# DATABASE CLASS
-# ──────────────────────────────────────────────
-class Database:
-    def __init__(self, db_path):
-        self.db_path = db_path
-        self.init_db()
-
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
-
-    def init_db(self):
-        """Database aur tables banao - schema.sql ki zaroorat nahi"""
-        try:
-            # Database folder automatically banao
-            db_dir = os.path.dirname(self.db_path)
-            if db_dir and not os.path.exists(db_dir):
-                os.makedirs(db_dir)
-
-            conn = self.get_connection()
-            conn.executescript("""
-                CREATE TABLE IF NOT EXISTS departments (
-                    dept_id    INTEGER PRIMARY KEY AUTOINCREMENT,
-                    dept_name  TEXT NOT NULL UNIQUE,
-                    dept_code  TEXT NOT NULL UNIQUE,
-                    hod_name   TEXT,
-                    created_at TEXT DEFAULT (datetime('now'))
-                );
-
-                CREATE TABLE IF NOT EXISTS courses (
-                    course_id   INTEGER PRIMARY KEY AUTOINCREMENT,
-                    course_name TEXT NOT NULL,
-                    course_code TEXT NOT NULL UNIQUE,
-                    credits     INTEGER NOT NULL,
-                    dept_id     INTEGER NOT NULL,
-                    semester    INTEGER NOT NULL,
-                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
-                );
-
-                CREATE TABLE IF NOT EXISTS students (
-                    student_id     INTEGER PRIMARY KEY AUTOINCREMENT,
-                    enrollment_no  TEXT NOT NULL UNIQUE,
-                    first_name     TEXT NOT NULL,
-                    last_name      TEXT NOT NULL,
-                    email          TEXT NOT NULL UNIQUE,
-                    phone          TEXT,
-                    dob            TEXT,
-                    gender         TEXT,
-                    dept_id        INTEGER NOT NULL,
-                    semester       INTEGER NOT NULL,
-                    admission_year INTEGER NOT NULL,
-                    status         TEXT DEFAULT 'Active',
-                    created_at     TEXT DEFAULT (datetime('now')),
-                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
-                );
-
-                CREATE TABLE IF NOT EXISTS student_addresses (
-                    address_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id INTEGER NOT NULL UNIQUE,
-                    street     TEXT,
-                    city       TEXT,
-                    state      TEXT,
-                    pincode    TEXT,
-                    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS faculty (
-                    faculty_id    INTEGER PRIMARY KEY AUTOINCREMENT,
-                    faculty_code  TEXT NOT NULL UNIQUE,
-                    first_name    TEXT NOT NULL,
-                    last_name     TEXT NOT NULL,
-                    email         TEXT NOT NULL UNIQUE,
-                    phone         TEXT,
-                    qualification TEXT,
-                    designation   TEXT,
-                    dept_id       INTEGER NOT NULL,
-                    joining_date  TEXT,
-                    status        TEXT DEFAULT 'Active',
-                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
-                );
-
-                CREATE TABLE IF NOT EXISTS enrollments (
-                    enrollment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id    INTEGER NOT NULL,
-                    course_id     INTEGER NOT NULL,
-                    academic_year TEXT NOT NULL,
-                    semester      INTEGER NOT NULL,
-                    enrolled_on   TEXT DEFAULT (datetime('now')),
-                    UNIQUE(student_id, course_id, academic_year),
-                    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
-                    FOREIGN KEY (course_id)  REFERENCES courses(course_id)  ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS grade_lookup (
-                    grade       TEXT PRIMARY KEY,
-                    grade_point REAL NOT NULL,
-                    min_marks   INTEGER NOT NULL,
-                    max_marks   INTEGER NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS grades (
-                    grade_id       INTEGER PRIMARY KEY AUTOINCREMENT,
-                    enrollment_id  INTEGER NOT NULL UNIQUE,
-                    marks_obtained INTEGER,
-                    grade          TEXT,
-                    remarks        TEXT,
-                    recorded_on    TEXT DEFAULT (datetime('now')),
-                    FOREIGN KEY (enrollment_id) REFERENCES enrollments(enrollment_id) ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS faculty_courses (
-                    assign_id     INTEGER PRIMARY KEY AUTOINCREMENT,
-                    faculty_id    INTEGER NOT NULL,
-                    course_id     INTEGER NOT NULL,
-                    academic_year TEXT NOT NULL,
-                    semester      INTEGER NOT NULL,
-                    FOREIGN KEY (faculty_id) REFERENCES faculty(faculty_id) ON DELETE CASCADE,
-                    FOREIGN KEY (course_id)  REFERENCES courses(course_id)  ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id       INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username      TEXT NOT NULL UNIQUE,
-                    password_hash TEXT NOT NULL,
-                    role          TEXT NOT NULL,
-                    ref_id        INTEGER,
-                    is_active     INTEGER DEFAULT 1,
-                    created_at    TEXT DEFAULT (datetime('now'))
-                );
-
-                INSERT OR IGNORE INTO grade_lookup VALUES ('O',  10.0, 90, 100);
-                INSERT OR IGNORE INTO grade_lookup VALUES ('A+',  9.0, 80,  89);
-                INSERT OR IGNORE INTO grade_lookup VALUES ('A',   8.0, 70,  79);
-                INSERT OR IGNORE INTO grade_lookup VALUES ('B+',  7.0, 60,  69);
-                INSERT OR IGNORE INTO grade_lookup VALUES ('B',   6.0, 50,  59);
-                INSERT OR IGNORE INTO grade_lookup VALUES ('C',   5.0, 40,  49);
-                INSERT OR IGNORE INTO grade_lookup VALUES ('F',   0.0,  0,  39);
-
-                INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name)
-                    VALUES ('Computer Science', 'CS', 'Dr. Ramesh Kumar');
-                INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name)
-                    VALUES ('Information Technology', 'IT', 'Dr. Priya Sharma');
-                INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name)
-                    VALUES ('Electronics', 'EC', 'Dr. Suresh Patel');
-                INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name)
-                    VALUES ('Mechanical Engineering', 'ME', 'Dr. Anjali Singh');
-            """)
-            conn.commit()
-            conn.close()
-            self.create_admin_user()
-        except Exception as e:
-            raise Exception(f"Database init error: {e}")
-
-    def create_admin_user(self):
-        conn = self.get_connection()
-        try:
-            pwd_hash = hash_password('admin123')
-            conn.execute(
-                "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?,?,?)",
-                ('admin', pwd_hash, 'admin')
-            )
-            conn.commit()
-        except Exception as e:
-            print(f"Warning: {e}")
-        finally:
-            conn.close()
+# Reverse proxy (nginx/campus gateway) ke peeche: TRUSTED_PROXIES = kitne proxies
+# X-Forwarded-For likhte hain. Bina iske rate limits sab ko proxy ka ek IP maante hain
+TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', 0))
+if TRUSTED_PROXIES:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES, x_proto=TRUSTED_PROXIES,
+                            x_host=TRUSTED_PROXIES)
 
-    def execute_query(self, query, params=()):
-        conn = self.get_connection()
-        try:
-            cur = conn.execute(query, params)
-            conn.commit()
-            return cur.lastrowid
-        except sqlite3.IntegrityError as e:
-            raise ValueError(f"Data conflict: {e}")
-        except sqlite3.Error as e:
-            raise Exception(f"DB Error: {e}")
-        finally:
-            conn.close()
-
-    def fetch_all(self, query, params=()):
-        conn = self.get_connection()
-        try:
-            cur = conn.execute(query, params)
-            return [dict(row) for row in cur.fetchall()]
-        except sqlite3.Error as e:
-            raise Exception(f"Fetch error: {e}")
-        finally:
-            conn.close()
-
-    def fetch_one(self, query, params=()):
-        conn = self.get_connection()
-        try:
-            cur = conn.execute(query, params)
-            row = cur.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            raise Exception(f"Fetch error: {e}")
-        finally:
-            conn.close()
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.environ.get('DATA_DIR', os.path.join(BASE_DIR, 'database'))   # tests temp dir dete hain
+DB_PATH  = os.path.join(DATA_DIR, 'university.db')
 
 
 # ──────────────────────────────────────────────
 # UTILITY FUNCTIONS
 # ──────────────────────────────────────────────
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
 def login_required(role=None):
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
-            if 'user_id' not in session:
+            # Server-side session + UserCache se role check - cache hit pe DB round trip nahi
+            user = sessions.get(session.get('sid'))
+            account = user_cache.get_by_id(user['user_id']) if user else None
+            if account is None or not account['is_active']:
+                # Deactivated/deleted user ka purana session bhi khatam
+                sessions.delete(session.get('sid'))
+                session.clear()
                 flash('Please login first!', 'warning')
                 return redirect(url_for('login'))
-            if role and session.get('role') != role and session.get('role') != 'admin':
+            if account['role'] != user['role'] or account['ref_id'] != user['ref_id']:
+                user = dict(user, role=account['role'], ref_id=account['ref_id'])
+                session['role'] = account['role']
+            g.user = user
+            if not role_allowed(user['role'], role):
                 flash('Access denied!', 'danger')
                 return redirect(url_for('dashboard'))
             return f(*args, **kwargs)
@@ -262,7 +84,64 @@ def generate_faculty_code():
 # ──────────────────────────────────────────────
 # INITIALIZE DB
 # ──────────────────────────────────────────────
-db = Database(DB_PATH)
+# MULTI_WORKER=1 (gunicorn.conf.py set karta hai): WAL, cross-process writer lock,
+# workers ke beech shared cache; warna sab process ke andar
+MULTI_WORKER = os.environ.get('MULTI_WORKER') == '1'
+if MULTI_WORKER:
+    shared_cache = SharedCache(os.path.join(DATA_DIR, 'cache.db'))
+else:
+    shared_cache = LocalCache()
+db = Database(DB_PATH,
+              group_commit=os.environ.get('GROUP_COMMIT') == '1',
+              writer_lock=WriterLock(DB_PATH + '.writelock') if MULTI_WORKER else None,
+              cache=shared_cache,
+              wal=MULTI_WORKER)
+user_cache = UserCache(db)
+sessions   = make_session_store(DATA_DIR)
+assets     = init_assets(app, BASE_DIR)
+timetables = TimetableCache(db, shared=shared_cache)
+
+
+def lookup(name, query, ttl=60):
+    """Chhoti reference tables (dropdowns, grade_lookup) - shared cache se, har write pe clear"""
+    return shared_cache.get_or_set(f'lookup:{name}', lambda: db.fetch_all(query), ttl)
+
+# Per-route query/time budgets (PROFILE=1 me check hote hain)
+profiler = init_profiler(app, db, budgets={
+    'dashboard': {'queries': 6},
+    'grades':    {'queries': 4},
+    'reports':   {'queries': 3},
+    'timetable': {'queries': 8, 'ms': 2000},
+})
+
+
+# ──────────────────────────────────────────────
+# ADMISSION CONTROL
+# ──────────────────────────────────────────────
+# rate = tokens/sec, capacity = burst; har ek {NAME}_RATE / {NAME}_BURST env se badlo.
+# Brute-force se bachav per-username bucket karta hai; per-IP sirf flood guard hai,
+# kyunki campus NAT / proxy ke peeche saare students ek hi IP se aate hain.
+auth_ip_limiter   = limiter_from_env('AUTH_IP',   rate=10,  capacity=200)  # login/register per IP
+auth_user_limiter = limiter_from_env('AUTH_USER', rate=0.2, capacity=5)    # login attempts per username
+api_ip_limiter    = limiter_from_env('API_IP',    rate=20,  capacity=100)
+api_user_limiter  = limiter_from_env('API_USER',  rate=5,   capacity=20)
+write_gate = WriteGate(
+    max_concurrent=int(os.environ.get('WRITE_CONCURRENCY', 2)),
+    max_waiting=int(os.environ.get('WRITE_QUEUE', 32)),
+    timeout=float(os.environ.get('WRITE_WAIT', 2.0)),
+)
+
+auth_throttle = rate_limit(ip_limiter=auth_ip_limiter, user_limiter=auth_user_limiter,
+                           user_key=lambda: request.form.get('username', '').strip(),
+                           methods=('POST',))
+api_throttle  = rate_limit(ip_limiter=api_ip_limiter, user_limiter=api_user_limiter)
+write_route   = write_admission(write_gate, methods=('POST',))
+delete_route  = write_admission(write_gate)
+
+# Import + init ka time (gunicorn.conf.py ka when_ready bhi yahi log karta hai)
+STARTUP_MS = (time.perf_counter() - _startup) * 1000
+app.logger.info("Startup: %.1f ms (%s mode)", STARTUP_MS,
+                'production' if is_production() else 'development')
 
 
 # ══════════════════════════════════════════════
@@ -274,17 +153,18 @@ def index():
     return redirect(url_for('login'))
 
 @app.route('/login', methods=['GET', 'POST'])
+@auth_throttle
 def login():
-    if 'user_id' in session:
+    if sessions.get(session.get('sid')):
         return redirect(url_for('dashboard'))
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
         password = request.form.get('password', '')
         try:
-            user = db.fetch_one(
-                "SELECT * FROM users WHERE username=? AND is_active=1", (username,)
-            )
-            if user and user['password_hash'] == hash_password(password):
+            user = user_cache.get_by_username(username)
+            if user and user['is_active'] and user['password_hash'] == hash_password(password):
+                session.clear()
+                session['sid']      = sessions.create(user)
                 session['user_id']  = user['user_id']
                 session['username'] = user['username']
                 session['role']     = user['role']
@@ -298,13 +178,16 @@ def login():
 
 @app.route('/logout')
 def logout():
+    sessions.delete(session.get('sid'))
     session.clear()
     flash('Logged out successfully.', 'info')
     return redirect(url_for('login'))
 
 @app.route('/register', methods=['GET', 'POST'])
+@auth_throttle
+@write_route
 def register():
-    if 'user_id' in session:
+    if sessions.get(session.get('sid')):
         return redirect(url_for('dashboard'))
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
@@ -323,7 +206,7 @@ def register():
         else:
             try:
                 # Check if username already exists
-                existing = db.fetch_one("SELECT user_id FROM users WHERE username=?", (username,))
+                existing = user_cache.get_by_username(username)
                 if existing:
                     flash('Username already taken!', 'danger')
                 else:
@@ -350,6 +233,7 @@ def register():
                         "UPDATE users SET ref_id=? WHERE user_id=?",
                         (student_id, user_id)
                     )
+                    user_cache.invalidate(user_id=user_id)
                     
                     flash(f'Account created! Your enrollment no: {enrollment_no}', 'success')
                     return redirect(url_for('login'))
@@ -360,12 +244,12 @@ def register():
 @app.route('/dashboard')
 @login_required()
 def dashboard():
-    stats = {
+    stats = shared_cache.get_or_set('dashboard_stats', lambda: {
         'students':    db.fetch_one("SELECT COUNT(*) as c FROM students WHERE status='Active'")['c'],
         'faculty':     db.fetch_one("SELECT COUNT(*) as c FROM faculty WHERE status='Active'")['c'],
         'departments': db.fetch_one("SELECT COUNT(*) as c FROM departments")['c'],
         'courses':     db.fetch_one("SELECT COUNT(*) as c FROM courses")['c'],
-    }
+    })
     recent = db.fetch_all("""
         SELECT s.first_name||' '||s.last_name as name, d.dept_name, s.created_at
         FROM students s JOIN departments d ON s.dept_id=d.dept_id
@@ -388,6 +272,7 @@ def departments():
 
 @app.route('/departments/add', methods=['GET', 'POST'])
 @login_required('admin')
+@write_route
 def add_department():
     if request.method == 'POST':
         try:
@@ -403,6 +288,7 @@ def add_department():
 
 @app.route('/departments/delete/<int:dept_id>')
 @login_required('admin')
+@delete_route
 def delete_department(dept_id):
     try:
         db.execute_query("DELETE FROM departments WHERE dept_id=?", (dept_id,))
@@ -434,14 +320,15 @@ def students():
         params.append(dept_id)
     query += " ORDER BY s.created_at DESC"
     student_list = db.fetch_all(query, params)
-    depts = db.fetch_all("SELECT * FROM departments ORDER BY dept_name")
+    depts = lookup('departments', "SELECT * FROM departments ORDER BY dept_name")
     return render_template('students.html', students=student_list, departments=depts,
                            search=search, dept_id=dept_id)
 
 @app.route('/students/add', methods=['GET', 'POST'])
 @login_required('admin')
+@write_route
 def add_student():
-    depts = db.fetch_all("SELECT * FROM departments ORDER BY dept_name")
+    depts = lookup('departments', "SELECT * FROM departments ORDER BY dept_name")
     if request.method == 'POST':
         try:
             enrollment_no = generate_enrollment_no()
@@ -507,9 +394,11 @@ def view_student(student_id):
 
 @app.route('/students/delete/<int:student_id>')
 @login_required('admin')
+@delete_route
 def delete_student(student_id):
     try:
         db.execute_query("DELETE FROM students WHERE student_id=?", (student_id,))
+        timetables.invalidate()         # enrollments bhi cascade se gaye
         flash('Student deleted!', 'success')
     except Exception as e:
         flash(f'Error: {e}', 'danger')
@@ -531,8 +420,9 @@ def faculty_list():
 
 @app.route('/faculty/add', methods=['GET', 'POST'])
 @login_required('admin')
+@write_route
 def add_faculty():
-    depts = db.fetch_all("SELECT * FROM departments ORDER BY dept_name")
+    depts = lookup('departments', "SELECT * FROM departments ORDER BY dept_name")
     if request.method == 'POST':
         try:
             faculty_code = generate_faculty_code()
@@ -560,9 +450,11 @@ def add_faculty():
 
 @app.route('/faculty/delete/<int:faculty_id>')
 @login_required('admin')
+@delete_route
 def delete_faculty(faculty_id):
     try:
         db.execute_query("DELETE FROM faculty WHERE faculty_id=?", (faculty_id,))
+        timetables.invalidate()
         flash('Faculty deleted!', 'success')
     except Exception as e:
         flash(f'Error: {e}', 'danger')
@@ -584,8 +476,9 @@ def courses():
 
 @app.route('/courses/add', methods=['GET', 'POST'])
 @login_required('admin')
+@write_route
 def add_course():
-    depts = db.fetch_all("SELECT * FROM departments ORDER BY dept_name")
+    depts = lookup('departments', "SELECT * FROM departments ORDER BY dept_name")
     if request.method == 'POST':
         try:
             db.execute_query(
@@ -601,9 +494,11 @@ def add_course():
 
 @app.route('/courses/delete/<int:course_id>')
 @login_required('admin')
+@delete_route
 def delete_course(course_id):
     try:
         db.execute_query("DELETE FROM courses WHERE course_id=?", (course_id,))
+        timetables.invalidate()
         flash('Course deleted!', 'success')
     except Exception as e:
         flash(f'Error: {e}', 'danger')
@@ -613,6 +508,7 @@ def delete_course(course_id):
 # ── ENROLLMENTS ──────────────────────────────────
 @app.route('/enrollments', methods=['GET', 'POST'])
 @login_required('admin')
+@write_route
 def enrollments():
     if request.method == 'POST':
         try:
@@ -621,6 +517,7 @@ def enrollments():
                 (request.form['student_id'], request.form['course_id'],
                  request.form['academic_year'], request.form['semester'])
             )
+            timetables.invalidate(request.form['academic_year'], int(request.form['semester']))
             flash('Student enrolled!', 'success')
         except ValueError as e:
             flash(str(e), 'danger')
@@ -636,7 +533,7 @@ def enrollments():
     students_list = db.fetch_all(
         "SELECT student_id, first_name||' '||last_name as name, enrollment_no FROM students WHERE status='Active'"
     )
-    courses_list = db.fetch_all("SELECT course_id, course_name, course_code FROM courses")
+    courses_list = lookup('courses', "SELECT course_id, course_name, course_code FROM courses")
     year = datetime.now().year
     return render_template('enrollments.html', enrollments=enroll_list,
                            students=students_list, courses=courses_list,
@@ -644,9 +541,11 @@ def enrollments():
 
 @app.route('/enrollments/delete/<int:enrollment_id>')
 @login_required('admin')
+@delete_route
 def delete_enrollment(enrollment_id):
     try:
         db.execute_query("DELETE FROM enrollments WHERE enrollment_id=?", (enrollment_id,))
+        timetables.invalidate()
         flash('Enrollment deleted!', 'success')
     except Exception as e:
         flash(f'Error: {e}', 'danger')
@@ -656,13 +555,12 @@ def delete_enrollment(enrollment_id):
 # ── GRADES ───────────────────────────────────────
 @app.route('/grades', methods=['GET', 'POST'])
 @login_required()
+@write_route
 def grades():
-    if request.method == 'POST' and session['role'] in ('admin', 'faculty'):
+    if request.method == 'POST' and has_permission(g.user['role'], 'grade'):
         marks = int(request.form['marks'])
-        grade_row = db.fetch_one(
-            "SELECT grade FROM grade_lookup WHERE ? BETWEEN min_marks AND max_marks", (marks,)
-        )
-        grade = grade_row['grade'] if grade_row else 'F'
+        grade = next((r['grade'] for r in lookup('grade_lookup', "SELECT * FROM grade_lookup")
+                      if r['min_marks'] <= marks <= r['max_marks']), 'F')
         try:
             db.execute_query("""
                 INSERT INTO grades (enrollment_id, marks_obtained, grade, remarks)
@@ -701,6 +599,7 @@ def grades():
 
 @app.route('/grades/delete/<int:grade_id>')
 @login_required('admin')
+@delete_route
 def delete_grade(grade_id):
     try:
         db.execute_query("DELETE FROM grades WHERE grade_id=?", (grade_id,))
@@ -736,22 +635,123 @@ def reports():
         HAVING COUNT(g.grade_id) >= 1
         ORDER BY cgpa DESC LIMIT 10
     """)
-    return render_template('reports.html', dept_stats=dept_stats, top_students=top_students)
+    sheet_courses = db.fetch_all("""
+        SELECT c.course_id, c.course_code, c.course_name, e.academic_year,
+               COUNT(e.enrollment_id) as students
+        FROM enrollments e
+        JOIN courses c ON e.course_id=c.course_id
+        GROUP BY c.course_id, e.academic_year
+        ORDER BY e.academic_year DESC, c.course_code
+    """)
+    return render_template('reports.html', dept_stats=dept_stats, top_students=top_students,
+                           sheet_courses=sheet_courses)
+
+@app.route('/reports/marksheet/<int:course_id>')
+@login_required('faculty')
+def course_marksheet(course_id):
+    year = datetime.now().year
+    academic_year = request.args.get('academic_year', f"{year}-{year+1}")
+    kind = request.args.get('kind', 'marksheet')
+    fmt  = request.args.get('format', 'html')
+    course = course_info(db, course_id)
+    if not course or kind not in KINDS:
+        flash('Course not found!', 'danger')
+        return redirect(url_for('reports'))
+    # Rows DB se stream hote hain - poori list memory me nahi aati
+    if fmt == 'pdf':
+        filename = f"{course['course_code']}_{kind}_{academic_year}.pdf"
+        return Response(stream_with_context(pdf_chunks(db, course, academic_year, kind)),
+                        mimetype='application/pdf',
+                        headers={'Content-Disposition': f'inline; filename="{filename}"'})
+    return Response(stream_with_context(html_chunks(db, course, academic_year, kind)),
+                    mimetype='text/html')
+
+
+# ── TIMETABLE ────────────────────────────────────
+@app.route('/timetable')
+@login_required()
+def timetable():
+    year = datetime.now().year
+    academic_year = request.args.get('academic_year', f"{year}-{year+1}").strip()
+    semester      = request.args.get('semester', 1, type=int)
+    # Har naya key ek solve + cache entry hai - sirf valid values
+    if not valid_academic_year(academic_year) or not 1 <= semester <= 8:
+        flash('Academic year must look like 2025-2026 and semester 1-8.', 'warning')
+        academic_year, semester = f"{year}-{year+1}", 1
+    tt = timetables.get(academic_year, semester)
+    faculty_options = lookup('active_faculty',
+        "SELECT faculty_id, first_name||' '||last_name as name, faculty_code FROM faculty WHERE status='Active'"
+    )
+    courses_list = lookup('courses', "SELECT course_id, course_name, course_code FROM courses")
+    return render_template('timetable.html', academic_year=academic_year, semester=semester,
+                           days=DAYS, periods=PERIODS, grid=tt.grid(), workload=tt.workload(),
+                           unscheduled=tt.unscheduled_sections(),
+                           faculty=faculty_options, courses=courses_list)
+
+@app.route('/timetable/assign', methods=['POST'])
+@login_required('admin')
+@write_route
+def timetable_assign():
+    academic_year = request.form.get('academic_year', '').strip()
+    semester      = request.form.get('semester', type=int)
+    course_id     = request.form.get('course_id', type=int)
+    faculty_id    = request.form.get('faculty_id', type=int)
+    if (not valid_academic_year(academic_year) or semester is None or not 1 <= semester <= 8
+            or course_id is None or faculty_id is None):
+        flash('Select a faculty and course; academic year must look like 2025-2026 and semester 1-8.',
+              'danger')
+        return redirect(url_for('timetable'))
+    try:
+        existing = db.fetch_one(
+            "SELECT assign_id FROM faculty_courses WHERE faculty_id=? AND course_id=? AND academic_year=?",
+            (faculty_id, course_id, academic_year)
+        )
+        if existing:
+            flash('Faculty already assigned to this course!', 'warning')
+        else:
+            db.execute_query(
+                "INSERT INTO faculty_courses (faculty_id, course_id, academic_year, semester) VALUES (?,?,?,?)",
+                (faculty_id, course_id, academic_year, semester)
+            )
+            # Sirf is course ke sections dobara schedule honge
+            timetables.update_course(academic_year, semester, course_id)
+            flash('Faculty assigned!', 'success')
+    except Exception as e:
+        flash(f'Error: {e}', 'danger')
+    return redirect(url_for('timetable', academic_year=academic_year, semester=semester))
 
 
 # ── API ──────────────────────────────────────────
 @app.route('/api/stats')
 @login_required()
+@api_throttle
 def api_stats():
-    return jsonify({
+    return jsonify(shared_cache.get_or_set('api_stats', lambda: {
         'students':    db.fetch_one("SELECT COUNT(*) as c FROM students")['c'],
         'faculty':     db.fetch_one("SELECT COUNT(*) as c FROM faculty")['c'],
         'courses':     db.fetch_one("SELECT COUNT(*) as c FROM courses")['c'],
         'enrollments': db.fetch_one("SELECT COUNT(*) as c FROM enrollments")['c'],
-    })
+    }))
+
+@app.route('/api/changes')
+@login_required('admin')        # downstream integrations - poore institute ka data
+@api_throttle
+def api_changes():
+    since = request.args.get('since', 0, type=int)
+    limit = min(max(request.args.get('limit', 500, type=int), 1), 5000)
+    return jsonify(fetch_changes(db, since, limit))
+
+@app.route('/api/changes/compact', methods=['POST'])
+@login_required('admin')
+@delete_route
+def api_compact_changes():
+    remaining = compact_changes(db)
+    return jsonify({'remaining': remaining})
 
 
 # ══════════════════════════════════════════════
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=True, host='0.0.0.0', port=port)
\ No newline at end of file
+    print(f"Startup: {STARTUP_MS:.1f} ms "
+          f"({'production' if is_production() else 'development'} mode)")
+    app.run(debug=not is_production(), host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+STATIC ASSET PIPELINE + TEMPLATE PRECOMPILE
+===========================================
+- static/ ki files startup pe ek baar padhi jaati hain, content hash se
+  fingerprint hoti hain (app.3f2a9c1b7e.css) aur gzip/brotli variants
+  pehle se bana liye jaate hain. /assets/... se long-lived cache headers
+  ke saath serve hoti hain.
+- Production mode (APP_ENV=production) me Jinja auto-reload band, saare
+  templates startup pe compile + bytecode cache.
+"""
+
+import os
+import gzip
+import time
+import hashlib
+import mimetypes
+
+from flask import request, abort, Response
+from jinja2 import FileSystemBytecodeCache
+
+try:
+    import brotli
+except ImportError:             # optional - na ho to sirf gzip
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.html', '.txt')
+ONE_YEAR = 365 * 24 * 3600
+
+
+def is_production():
+    return os.environ.get('APP_ENV', 'development') == 'production'
+
+
+class AssetPipeline:
+    def __init__(self, static_dir):
+        self.static_dir = static_dir
+        self.urls = {}      # 'css/app.css' -> 'css/app.<hash>.css'
+        self.files = {}     # 'css/app.<hash>.css' -> {'mimetype', 'identity', 'gzip', 'br'}
+        self.build()
+
+    def build(self):
+        self.urls.clear()
+        self.files.clear()
+        if not os.path.isdir(self.static_dir):
+            return
+        for root, _, names in os.walk(self.static_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                logical = os.path.relpath(path, self.static_dir).replace(os.sep, '/')
+                with open(path, 'rb') as fh:
+                    data = fh.read()
+                digest = hashlib.md5(data).hexdigest()[:10]
+                base, ext = os.path.splitext(logical)
+                fingerprinted = f"{base}.{digest}{ext}"
+                variants = {
+                    'mimetype': mimetypes.guess_type(name)[0] or 'application/octet-stream',
+                    'identity': data,
+                }
+                if ext in COMPRESSIBLE:
+                    variants['gzip'] = gzip.compress(data, compresslevel=9, mtime=0)
+                    if brotli:
+                        variants['br'] = brotli.compress(data)
+                self.urls[logical] = fingerprinted
+                self.files[fingerprinted] = variants
+
+    def url(self, logical):
+        return '/assets/' + self.urls.get(logical, logical)
+
+    def response(self, filename):
+        entry = self.files.get(filename)
+        if entry is None:
+            abort(404)
+        # Accept-Encoding ke q-values dekho - "gzip;q=0" matlab gzip nahi chahiye
+        accepted = request.accept_encodings
+        encoding, best = 'identity', 0
+        for enc in ('br', 'gzip'):
+            q = accepted.quality(enc)
+            if enc in entry and q > best:
+                encoding, best = enc, q
+        resp = Response(entry[encoding], mimetype=entry['mimetype'])
+        if encoding != 'identity':
+            resp.headers['Content-Encoding'] = encoding
+        resp.headers['Vary'] = 'Accept-Encoding'
+        resp.headers['Cache-Control'] = f'public, max-age={ONE_YEAR}, immutable'
+        return resp
+
+
+def precompile_templates(app, cache_dir):
+    """Saare .html templates abhi compile karo - bytecode cache disk pe"""
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    env = app.jinja_env
+    env.auto_reload = False
+    env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    names = [n for n in env.list_templates() if n.endswith('.html')]
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def init_assets(app, base_dir):
+    """Asset route + asset_url() template helper; production me templates precompile"""
+    start = time.perf_counter()
+    pipeline = AssetPipeline(os.path.join(base_dir, 'static'))
+
+    @app.route('/assets/<path:filename>')
+    def assets(filename):
+        return pipeline.response(filename)
+
+    @app.context_processor
+    def asset_helpers():
+        return {'asset_url': pipeline.url}
+
+    if is_production():
+        count = precompile_templates(app, os.path.join(base_dir, '.jinja_cache'))
+        app.logger.info("Precompiled %d templates", count)
+    app.logger.info("Assets ready in %.1f ms", (time.perf_counter() - start) * 1000)
+    return pipeline
@@ -0,0 +1,270 @@
+"""
+AUTH MODULE
+===========
+Login/session ka fast path:
+- UserCache     : bounded in-memory LRU cache of users rows (username/user_id se)
+- SessionStore  : server-side sessions, cookie me sirf opaque token ('sid') jaata hai
+- ROLE_PERMISSIONS / has_permission : role checks bina DB round trip ke
+"""
+
+import os
+import time
+import sqlite3
+import secrets
+import threading
+from collections import OrderedDict
+
+
+# ──────────────────────────────────────────────
+# ROLES & PERMISSIONS
+# ──────────────────────────────────────────────
+ROLE_PERMISSIONS = {
+    'admin':   {'*'},
+    'faculty': {'view', 'grade'},
+    'student': {'view'},
+}
+
+def has_permission(role, permission):
+    perms = ROLE_PERMISSIONS.get(role, set())
+    return '*' in perms or permission in perms
+
+def role_allowed(user_role, required_role):
+    """Admin sab kuch kar sakta hai, baaki roles sirf apna"""
+    if not required_role:
+        return True
+    return user_role == required_role or user_role == 'admin'
+
+
+# ──────────────────────────────────────────────
+# USER CACHE
+# ──────────────────────────────────────────────
+class UserCache:
+    """
+    users table ka bounded LRU cache - username aur user_id dono se lookup.
+    Entries ttl seconds tak valid - doosre worker (ya seedha DB) me hua
+    deactivate/role change bhi itni der me dikh jaata hai.
+    """
+
+    def __init__(self, db, max_size=1024, ttl=60):
+        self.db = db
+        self.max_size = max_size
+        self.ttl = ttl
+        self._by_id = OrderedDict()     # user_id -> (user, expires)
+        self._id_by_name = {}
+        self._lock = threading.Lock()
+
+    def _store(self, user):
+        with self._lock:
+            uid = user['user_id']
+            self._by_id[uid] = (user, time.time() + self.ttl)
+            self._by_id.move_to_end(uid)
+            self._id_by_name[user['username']] = uid
+            while len(self._by_id) > self.max_size:
+                _, (old, _) = self._by_id.popitem(last=False)
+                self._id_by_name.pop(old['username'], None)
+
+    def _lookup(self, uid):
+        with self._lock:
+            entry = self._by_id.get(uid)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires < time.time():
+                del self._by_id[uid]
+                self._id_by_name.pop(user['username'], None)
+                return None
+            self._by_id.move_to_end(uid)
+            return user
+
+    def get_by_username(self, username):
+        with self._lock:
+            uid = self._id_by_name.get(username)
+        user = self._lookup(uid) if uid is not None else None
+        if user is None:
+            # Misses cache nahi karte - naya user INSERT hote hi dikh jaana chahiye
+            user = self.db.fetch_one("SELECT * FROM users WHERE username=?", (username,))
+            if user:
+                self._store(user)
+        return user
+
+    def get_by_id(self, user_id):
+        """login_required har request pe yahi dekhta hai - hit pe DB round trip nahi"""
+        user = self._lookup(user_id)
+        if user is None:
+            user = self.db.fetch_one("SELECT * FROM users WHERE user_id=?", (user_id,))
+            if user:
+                self._store(user)
+        return user
+
+    def invalidate(self, user_id=None, username=None):
+        """users table me UPDATE/DELETE ke baad call karo"""
+        with self._lock:
+            if username is not None and user_id is None:
+                user_id = self._id_by_name.get(username)
+            if user_id is not None:
+                old = self._by_id.pop(user_id, None)
+                if old:
+                    self._id_by_name.pop(old[0]['username'], None)
+            if username is not None:
+                self._id_by_name.pop(username, None)
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._id_by_name.clear()
+
+    def __len__(self):
+        return len(self._by_id)
+
+
+# ──────────────────────────────────────────────
+# SESSION STORES
+# ──────────────────────────────────────────────
+def _session_data(user):
+    return {
+        'user_id':  user['user_id'],
+        'username': user['username'],
+        'role':     user['role'],
+        'ref_id':   user.get('ref_id'),
+    }
+
+
+class MemorySessionStore:
+    """
+    Process-local session store. Lock contention kam rakhne ke liye
+    tokens ko shards me baanta hai - har shard ka apna dict + lock.
+    """
+
+    def __init__(self, ttl=8 * 3600, shards=16, purge_interval=60):
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._next_purge = time.time() + purge_interval
+        self._shards = [({}, threading.Lock()) for _ in range(shards)]
+
+    def _shard(self, token):
+        return self._shards[hash(token) % len(self._shards)]
+
+    def create(self, user):
+        # Jo sessions wapas nahi aaye (logout nahi kiya) unhe bhi hatao
+        if time.time() >= self._next_purge:
+            self._next_purge = time.time() + self.purge_interval
+            self.purge_expired()
+        token = secrets.token_urlsafe(32)
+        data = _session_data(user)
+        data['expires'] = time.time() + self.ttl
+        store, lock = self._shard(token)
+        with lock:
+            store[token] = data
+        return token
+
+    def get(self, token):
+        if not token:
+            return None
+        store, lock = self._shard(token)
+        with lock:
+            data = store.get(token)
+            if data and data['expires'] < time.time():
+                del store[token]
+                data = None
+        return data
+
+    def delete(self, token):
+        if not token:
+            return
+        store, lock = self._shard(token)
+        with lock:
+            store.pop(token, None)
+
+    def purge_expired(self):
+        now = time.time()
+        for store, lock in self._shards:
+            with lock:
+                for token in [t for t, d in store.items() if d['expires'] < now]:
+                    del store[token]
+
+
+class SqliteSessionStore:
+    """
+    SQLite-backed session store - alag file, taaki main DB ka writer lock
+    na pakde. Multiple worker processes ek hi sessions dekh sakte hain.
+    """
+
+    def __init__(self, db_path, ttl=8 * 3600, purge_interval=60):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._next_purge = time.time() + purge_interval
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_sessions (
+                token    TEXT PRIMARY KEY,
+                user_id  INTEGER NOT NULL,
+                username TEXT NOT NULL,
+                role     TEXT NOT NULL,
+                ref_id   INTEGER,
+                expires  REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON user_sessions(user_id)")
+        conn.commit()
+        conn.close()
+
+    def _connect(self):
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _write(self, query, params=()):
+        conn = self._connect()
+        try:
+            conn.execute(query, params)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create(self, user):
+        if time.time() >= self._next_purge:
+            self._next_purge = time.time() + self.purge_interval
+            self.purge_expired()
+        token = secrets.token_urlsafe(32)
+        data = _session_data(user)
+        self._write(
+            "INSERT INTO user_sessions (token, user_id, username, role, ref_id, expires) VALUES (?,?,?,?,?,?)",
+            (token, data['user_id'], data['username'], data['role'], data['ref_id'],
+             time.time() + self.ttl)
+        )
+        return token
+
+    def get(self, token):
+        if not token:
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM user_sessions WHERE token=? AND expires>=?", (token, time.time())
+            ).fetchone()
+            if not row:
+                return None
+            data = dict(row)
+            data.pop('token')
+            return data
+        finally:
+            conn.close()
+
+    def delete(self, token):
+        if token:
+            self._write("DELETE FROM user_sessions WHERE token=?", (token,))
+
+    def purge_expired(self):
+        self._write("DELETE FROM user_sessions WHERE expires<?", (time.time(),))
+
+
+def make_session_store(data_dir):
+    """SESSION_BACKEND=sqlite ho to SQLite store (data_dir/sessions.db), warna memory"""
+    if os.environ.get('SESSION_BACKEND', 'memory') == 'sqlite':
+        return SqliteSessionStore(os.path.join(data_dir, 'sessions.db'))
+    return MemorySessionStore()
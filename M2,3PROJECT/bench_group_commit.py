@@ -0,0 +1,61 @@
+"""
+Group commit benchmark
+======================
+Per-call commit (default execute_query) vs GroupCommitWriter.
+Temp database pe N threads se concurrent INSERTs chalata hai.
+
+    python bench_group_commit.py [threads] [writes_per_thread]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+
+from storage import Database
+
+
+def run(db, threads, per_thread):
+    errors = []
+
+    def worker(t):
+        for i in range(per_thread):
+            try:
+                db.execute_query(
+                    "INSERT INTO departments (dept_name, dept_code) VALUES (?,?)",
+                    (f"Bench {t}-{i}", f"B{t}-{i}")
+                )
+            except Exception as e:
+                errors.append(e)
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for th in pool:
+        th.start()
+    for th in pool:
+        th.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, len(errors)
+
+
+def main():
+    threads    = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    total = threads * per_thread
+    tmp = tempfile.mkdtemp()
+    try:
+        for label, group in (('per-call commit', False), ('group commit', True)):
+            db = Database(os.path.join(tmp, f"{label.replace(' ', '_')}.db"), group_commit=group)
+            elapsed, errors = run(db, threads, per_thread)
+            if db.writer:
+                db.writer.close()
+            print(f"{label:16s} {total} writes, {threads} threads: "
+                  f"{elapsed:.2f}s  {total / elapsed:8.0f} writes/s  errors={errors}")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Multi-worker read route benchmark
+=================================
+Deployment wala path: MULTI_WORKER=1 (WAL, SharedCache, WriterLock) aur
+SQLite sessions ke saath app ek baar import hota hai (gunicorn preload_app
+jaisa), phir 1, 2, 4 ... N forked workers WSGI app ko test client se chalate
+hain - logged in user ke read routes (dashboard, students, student profile,
+/api/stats, timetable). HTTP socket parsing shaamil nahi, baaki poora request
+path (session, rate limit hooks, SQL, templates) hai.
+
+    python bench_workers.py [max_workers] [seconds]
+
+Speedup ka matlab tabhi hai jab machine pe utne cores hon - 1 CPU pe sab
+workers ek hi core share karte hain.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import multiprocessing
+from datetime import datetime
+
+DURATION = 2.0
+STUDENTS = 500
+
+
+def seed(db, students=STUDENTS):
+    year = datetime.now().year
+    academic_year = f"{year}-{year+1}"
+    conn = db.get_connection()
+    for c in range(4):
+        conn.execute("INSERT INTO courses (course_name, course_code, credits, dept_id, semester) VALUES (?,?,4,1,1)",
+                     (f'Bench {c}', f'BN10{c}'))
+    for f in range(2):
+        conn.execute("INSERT INTO faculty (faculty_code, first_name, last_name, email, dept_id) VALUES (?,?,?,?,1)",
+                     (f'BF{f}', 'Bench', str(f), f'bf{f}@bench'))
+    for c in range(4):
+        conn.execute("INSERT INTO faculty_courses (faculty_id, course_id, academic_year, semester) VALUES (?,?,?,1)",
+                     (c % 2 + 1, c + 1, academic_year))
+    for i in range(students):
+        cur = conn.execute("""
+            INSERT INTO students (enrollment_no, first_name, last_name, email, dept_id, semester, admission_year)
+            VALUES (?,?,?,?,?,?,?)
+        """, (f"B{i:05d}", 'Bench', str(i), f"b{i}@bench", i % 4 + 1, 1, year))
+        conn.execute("INSERT INTO enrollments (student_id, course_id, academic_year, semester) VALUES (?,?,?,1)",
+                     (cur.lastrowid, i % 4 + 1, academic_year))
+    conn.commit()
+    conn.close()
+
+
+def routes(students):
+    n = 0
+    while True:
+        yield '/dashboard'
+        yield f'/students?dept_id={n % 4 + 1}'
+        yield f'/students/view/{n % students + 1}'
+        yield '/api/stats'
+        yield '/timetable'
+        n += 1
+
+
+def worker(app_module, students, duration, results):
+    client = app_module.app.test_client()
+    resp = client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    if resp.status_code != 302:
+        results.put((0, 1))
+        return
+    ok = failed = 0
+    paths = routes(students)
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        if client.get(next(paths)).status_code == 200:
+            ok += 1
+        else:
+            failed += 1
+    results.put((ok, failed))
+
+
+def run(app_module, students, procs, duration):
+    results = multiprocessing.Queue()
+    pool = [multiprocessing.Process(target=worker, args=(app_module, students, duration, results))
+            for _ in range(procs)]
+    for p in pool:
+        p.start()
+    counts = [results.get() for _ in pool]
+    for p in pool:
+        p.join()
+    return sum(ok for ok, _ in counts) / duration, sum(failed for _, failed in counts)
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    duration    = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION
+    tmp = tempfile.mkdtemp()
+    # gunicorn.conf.py wala setup, temp DATA_DIR pe. Rate limits band - benchmark
+    # ek hi IP/user se hai, warna 429 hi naapenge
+    os.environ.update({'DATA_DIR': tmp, 'MULTI_WORKER': '1', 'SESSION_BACKEND': 'sqlite',
+                       'AUTH_IP_RATE': '0', 'AUTH_USER_RATE': '0',
+                       'API_IP_RATE': '0', 'API_USER_RATE': '0'})
+    os.environ.pop('PROFILE', None)
+    try:
+        import app as app_module
+        seed(app_module.db)
+        print(f"{os.cpu_count()} CPU(s), journal_mode="
+              f"{app_module.db.fetch_one('PRAGMA journal_mode')['journal_mode']}")
+        base = None
+        n = 1
+        while n <= max_workers:
+            rate, failed = run(app_module, STUDENTS, n, duration)
+            base = base or rate
+            print(f"{n:3d} workers: {rate:8.0f} requests/s   speedup {rate / base:5.2f}x"
+                  + (f"   ({failed} non-200)" if failed else ''))
+            n *= 2
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    multiprocessing.set_start_method('fork')
+    main()
@@ -0,0 +1,101 @@
+"""
+CHANGE DATA CAPTURE
+===================
+Triggers students/enrollments/grades/faculty ke har INSERT/UPDATE/DELETE
+ko change_log me likhte hain (seq = monotonically increasing).
+Downstream systems (library, hostel, fee) /api/changes?since=N se sirf
+badle hue rows lete hain - poori table dobara download nahi karni padti.
+Log compact rakha jaata hai: har row ki sirf latest entry bachti hai.
+"""
+
+# table -> primary key column
+CDC_TABLES = {
+    'students':    'student_id',
+    'enrollments': 'enrollment_id',
+    'grades':      'grade_id',
+    'faculty':     'faculty_id',
+}
+
+# Downstream systems ko sirf ye columns milte hain - email/phone/dob/marks nahi
+CDC_COLUMNS = {
+    'students':    ['student_id', 'enrollment_no', 'first_name', 'last_name',
+                    'dept_id', 'semester', 'admission_year', 'status'],
+    'enrollments': ['enrollment_id', 'student_id', 'course_id', 'academic_year', 'semester'],
+    'grades':      ['grade_id', 'enrollment_id', 'grade'],
+    'faculty':     ['faculty_id', 'faculty_code', 'first_name', 'last_name',
+                    'dept_id', 'designation', 'status'],
+}
+
+def cdc_schema_sql():
+    """change_log table + triggers - Database.init_db me chalta hai (schema.sql me bhi same rakho)"""
+    sql = """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            op         TEXT NOT NULL,
+            row_id     INTEGER NOT NULL,
+            changed_at TEXT DEFAULT (datetime('now'))
+        );
+        CREATE INDEX IF NOT EXISTS idx_change_log_row ON change_log(table_name, row_id);
+    """
+    for table, pk in CDC_TABLES.items():
+        for op, ref in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            sql += f"""
+        CREATE TRIGGER IF NOT EXISTS cdc_{table}_{op.lower()}
+        AFTER {op} ON {table}
+        BEGIN
+            INSERT INTO change_log (table_name, op, row_id) VALUES ('{table}', '{op}', {ref}.{pk});
+        END;
+            """
+    return sql
+
+
+def fetch_changes(db, since=0, limit=500):
+    """
+    since ke baad ke changes, seq order me, max limit.
+    Har change ke saath row ki current state - sirf CDC_COLUMNS (DELETE ho to None).
+    """
+    changes = db.fetch_all(
+        "SELECT seq, table_name, op, row_id, changed_at FROM change_log WHERE seq>? ORDER BY seq LIMIT ?",
+        (since, limit + 1)
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    # Table-wise ek hi query me current rows lao
+    rows = {}
+    for table, pk in CDC_TABLES.items():
+        ids = sorted({c['row_id'] for c in changes if c['table_name'] == table and c['op'] != 'DELETE'})
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ','.join('?' * len(chunk))
+            columns = ', '.join(CDC_COLUMNS[table])
+            for row in db.fetch_all(f"SELECT {columns} FROM {table} WHERE {pk} IN ({marks})", chunk):
+                rows[(table, row[pk])] = row
+
+    result = []
+    for c in changes:
+        result.append({
+            'seq':        c['seq'],
+            'table':      c['table_name'],
+            'op':         c['op'],
+            'id':         c['row_id'],
+            'changed_at': c['changed_at'],
+            'row':        rows.get((c['table_name'], c['row_id'])),
+        })
+    return {
+        'changes':  result,
+        'since':    since,
+        'next':     changes[-1]['seq'] if changes else since,
+        'has_more': has_more,
+    }
+
+
+def compact_changes(db):
+    """Har (table, row) ki sirf latest entry rakho - purani entries delete"""
+    db.execute_query("""
+        DELETE FROM change_log WHERE seq NOT IN (
+            SELECT MAX(seq) FROM change_log GROUP BY table_name, row_id
+        )
+    """)
+    return db.fetch_one("SELECT COUNT(*) as c FROM change_log")['c']
@@ -0,0 +1,130 @@
+"""
+GROUP COMMIT WRITER
+===================
+Ek dedicated writer thread, jo kai request threads ke writes ko queue se
+uthakar ek hi transaction me commit karta hai (har few ms me ek fsync).
+Har write apne SAVEPOINT me chalta hai, isliye ek write fail ho to sirf
+usi caller ko error milta hai - baaki batch commit ho jaata hai.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+
+
+class _Pending:
+    __slots__ = ('query', 'params', 'done', 'result', 'error')
+
+    def __init__(self, query, params):
+        self.query = query
+        self.params = params
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class GroupCommitWriter:
+    def __init__(self, db_path, max_batch=256, max_delay=0.005, lock=None):
+        self.db_path = db_path
+        self.lock = lock or nullcontext()   # multi-process WriterLock
+        self.max_batch = max_batch
+        self.max_delay = max_delay      # seconds - batch bharne ke liye kitna rukna
+        self._queue = queue.Queue()
+        self._conn = None
+        self._thread = threading.Thread(target=self._run, name='group-commit-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, query, params=()):
+        """Write queue me daalo aur commit hone tak wait karo - lastrowid return"""
+        item = _Pending(query, params)
+        self._queue.put(item)
+        while not item.done.wait(1.0):
+            if not self._thread.is_alive():
+                raise Exception("DB Error: group commit writer is not running")
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    # ── writer thread ──────────────────────────
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = self._collect(self._queue.get())
+            if None in batch:
+                stop = True
+                batch = [b for b in batch if b is not None]
+            if batch:
+                self._commit_batch(batch)
+        if self._conn is not None:
+            self._conn.close()
+
+    def _commit_batch(self, batch):
+        try:
+            if self._conn is None:
+                self._conn = self._connect()
+            with self.lock:
+                self._write_batch(self._conn, batch)
+        except Exception as e:
+            # Lock (flock OSError) ya connection fail - batch ke callers ko error,
+            # connection dobara khulega, writer thread zinda rahega
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            for item in batch:
+                item.result = None
+                item.error = _wrap(e)
+        finally:
+            for item in batch:
+                item.done.set()
+
+    def _write_batch(self, conn, batch):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for item in batch:
+                conn.execute("SAVEPOINT w")
+                try:
+                    item.result = conn.execute(item.query, item.params).lastrowid
+                    conn.execute("RELEASE w")
+                except Exception as e:
+                    # sqlite3.Error ya caller ka bind error (OverflowError etc.) -
+                    # sirf isi item ka, baaki batch commit hoga
+                    conn.execute("ROLLBACK TO w")
+                    conn.execute("RELEASE w")
+                    item.error = _wrap(e)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for item in batch:
+                item.result = None
+                item.error = _wrap(e)
+
+
+def _wrap(e):
+    # Database.execute_query jaisa hi error mapping
+    if isinstance(e, sqlite3.IntegrityError):
+        return ValueError(f"Data conflict: {e}")
+    return Exception(f"DB Error: {e}")
@@ -0,0 +1,33 @@
+"""
+Multi-worker deployment (pre-fork)
+==================================
+    gunicorn -c gunicorn.conf.py app:app
+
+- Har worker fork ke baad apne SQLite connections khud kholta hai
+  (Database har call pe connection kholta hai; group-commit writer thread
+  aur SharedCache connection PID check karke lazily bante hain)
+- Sessions SQLite me (database/sessions.db) - kisi bhi worker pe login valid
+- Stats cache database/cache.db me - saare workers share karte hain
+- Writes ek cross-process file lock (WriterLock) ke peeche - ek time pe ek writer
+"""
+
+import os
+import sys
+import multiprocessing
+
+os.environ.setdefault('MULTI_WORKER', '1')
+os.environ.setdefault('SESSION_BACKEND', 'sqlite')
+os.environ.setdefault('APP_ENV', 'production')
+
+bind         = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers      = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads      = int(os.environ.get('WORKER_THREADS', 4))
+preload_app  = True         # templates/assets ek baar master me load, workers fork se share
+timeout      = 30
+
+
+def when_ready(server):
+    # preload_app: app master me import ho chuka hai - uska startup time log karo
+    app_module = sys.modules.get('app')
+    if app_module is not None:
+        server.log.info("App startup: %.1f ms", app_module.STARTUP_MS)
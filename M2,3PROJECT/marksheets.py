@@ -0,0 +1,288 @@
+"""
+ROSTERS & MARK SHEETS
+=====================
+Course-wise roster / mark sheet generation jo poori list memory me nahi rakhta:
+- Rows keyset pages me aate hain (student_id > last, index order) - har page
+  ek chhota connection, download ke beech koi read cursor khula nahi rehta
+  (rollback-journal mode me writers block nahi hote)
+- HTML aur PDF dono chunk-by-chunk bante hain (PDF writer pure Python hai -
+  sirf object offsets yaad rakhta hai, rows nahi)
+- Poore semester/department ke sheets process pool me parallel, har worker
+  ek memory ceiling (RLIMIT_AS) ke andar
+
+CLI:
+    python marksheets.py --year 2025-2026 [--dept CS] [--kind marksheet|roster]
+                         [--format pdf|html|both] [--out marksheets] [--workers 4] [--db path]
+"""
+
+import os
+import sys
+import argparse
+from html import escape
+from concurrent.futures import ProcessPoolExecutor
+
+from storage import Database
+
+try:
+    import resource
+except ImportError:             # Windows - memory ceiling nahi lagta
+    resource = None
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'university.db')
+
+KINDS = {
+    'marksheet': {
+        'title':   'Mark Sheet',
+        'columns': [('#', 30), ('Enrollment No', 90), ('Name', 170), ('Marks', 50),
+                    ('Grade', 45), ('Points', 45), ('Remarks', 100)],
+        'fields':  ['enrollment_no', 'name', 'marks_obtained', 'grade', 'grade_point', 'remarks'],
+    },
+    'roster': {
+        'title':   'Course Roster',
+        'columns': [('#', 30), ('Enrollment No', 90), ('Name', 170), ('Email', 170), ('Semester', 70)],
+        'fields':  ['enrollment_no', 'name', 'email', 'semester'],
+    },
+}
+
+ROSTER_PAGE = 500
+
+ROSTER_QUERY = """
+    SELECT e.student_id, s.enrollment_no, s.first_name||' '||s.last_name as name, s.email,
+           e.semester, g.marks_obtained, g.grade, gl.grade_point, g.remarks
+    FROM enrollments e
+    JOIN students s ON e.student_id=s.student_id
+    LEFT JOIN grades g ON e.enrollment_id=g.enrollment_id
+    LEFT JOIN grade_lookup gl ON g.grade=gl.grade
+    WHERE e.course_id=? AND e.academic_year=? AND e.student_id > ?
+    ORDER BY e.student_id
+    LIMIT ?
+"""
+
+
+def course_info(db, course_id):
+    return db.fetch_one("""
+        SELECT c.course_id, c.course_name, c.course_code, c.credits, c.semester,
+               d.dept_name, d.dept_code
+        FROM courses c JOIN departments d ON c.dept_id=d.dept_id
+        WHERE c.course_id=?
+    """, (course_id,))
+
+
+def iter_sheet_rows(db, course_id, academic_year, kind='marksheet'):
+    fields = KINDS[kind]['fields']
+    n = 0
+    last = 0
+    while True:
+        # (course_id, academic_year, student_id) unique hai - last student_id se aage
+        rows = db.fetch_all(ROSTER_QUERY, (course_id, academic_year, last, ROSTER_PAGE))
+        for row in rows:
+            n += 1
+            yield [str(n)] + ['' if row[f] is None else str(row[f]) for f in fields]
+        if len(rows) < ROSTER_PAGE:
+            return
+        last = rows[-1]['student_id']
+
+
+def _heading(course, academic_year, kind):
+    return (f"{KINDS[kind]['title']} - {course['course_code']} {course['course_name']}",
+            f"{course['dept_name']} | Semester {course['semester']} | "
+            f"Credits {course['credits']} | Academic Year {academic_year}")
+
+
+# ──────────────────────────────────────────────
+# HTML (chunked)
+# ──────────────────────────────────────────────
+def html_chunks(db, course, academic_year, kind='marksheet', rows_per_chunk=200):
+    title, subtitle = _heading(course, academic_year, kind)
+    yield (f"<!DOCTYPE html><html><head><meta charset=\"UTF-8\"><title>{escape(title)}</title>"
+           "<style>body{font-family:'Segoe UI',sans-serif;font-size:13px;margin:24px}"
+           "table{border-collapse:collapse;width:100%}th,td{border:1px solid #ccc;padding:4px 6px}"
+           "th{background:#f8f9ff}@media print{thead{display:table-header-group}}</style>"
+           f"</head><body><h3>{escape(title)}</h3><p>{escape(subtitle)}</p><table><thead><tr>"
+           + ''.join(f"<th>{escape(c)}</th>" for c, _ in KINDS[kind]['columns'])
+           + "</tr></thead><tbody>")
+    buf = []
+    count = 0
+    for row in iter_sheet_rows(db, course['course_id'], academic_year, kind):
+        buf.append('<tr>' + ''.join(f"<td>{escape(v)}</td>" for v in row) + '</tr>')
+        count += 1
+        if len(buf) >= rows_per_chunk:
+            yield ''.join(buf)
+            buf = []
+    if buf:
+        yield ''.join(buf)
+    yield f"</tbody></table><p>Total students: {count}</p></body></html>"
+
+
+# ──────────────────────────────────────────────
+# PDF (pure Python, streaming)
+# ──────────────────────────────────────────────
+PAGE_W, PAGE_H = 595, 842       # A4 points
+MARGIN     = 40
+LINE       = 14
+FONT_SIZE  = 9
+
+
+def _pdf_text(value, width):
+    # Helvetica ~0.5em per char - lambi value kaat do
+    max_chars = max(1, int(width / (FONT_SIZE * 0.5)))
+    if len(value) > max_chars:
+        value = value[:max_chars - 1] + '.'
+    value = value.encode('latin-1', 'replace').decode('latin-1')
+    return value.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+class _PdfStream:
+    """Objects likhta hai aur sirf unke byte offsets yaad rakhta hai"""
+
+    def __init__(self):
+        self.offset = 0
+        self.offsets = {}
+
+    def emit(self, data):
+        self.offset += len(data)
+        return data
+
+    def obj(self, num, body):
+        self.offsets[num] = self.offset
+        return self.emit(f"{num} 0 obj\n".encode() + body + b"\nendobj\n")
+
+
+def pdf_chunks(db, course, academic_year, kind='marksheet'):
+    """PDF bytes chunks me - har page likhte hi yield"""
+    title, subtitle = _heading(course, academic_year, kind)
+    columns = KINDS[kind]['columns']
+    out = _PdfStream()
+    # 1 = catalog, 2 = pages, 3 = font, 4 = bold font; pages 5 se shuru
+    yield out.emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    yield out.obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    yield out.obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    yield out.obj(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+    page_ids = []
+    next_id = 5
+
+    def header_lines(page_no):
+        y = PAGE_H - MARGIN
+        lines = [f"BT /F2 12 Tf {MARGIN} {y} Td ({_pdf_text(title, PAGE_W)}) Tj ET",
+                 f"BT /F1 {FONT_SIZE} Tf {MARGIN} {y - 16} Td ({_pdf_text(subtitle, PAGE_W)}) Tj ET",
+                 f"BT /F1 {FONT_SIZE} Tf {PAGE_W - MARGIN - 40} {MARGIN - 20} Td (Page {page_no}) Tj ET"]
+        y -= 40
+        x = MARGIN
+        for name, width in columns:
+            lines.append(f"BT /F2 {FONT_SIZE} Tf {x} {y} Td ({_pdf_text(name, width)}) Tj ET")
+            x += width
+        lines.append(f"{MARGIN} {y - 4} m {PAGE_W - MARGIN} {y - 4} l S")
+        return lines, y - LINE
+
+    def flush_page(lines):
+        nonlocal next_id
+        content = '\n'.join(lines).encode('latin-1')
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        chunk = out.obj(content_id, f"<< /Length {len(content)} >>\nstream\n".encode()
+                        + content + b"\nendstream")
+        chunk += out.obj(page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode())
+        return chunk
+
+    lines, y = header_lines(1)
+    count = 0
+    for row in iter_sheet_rows(db, course['course_id'], academic_year, kind):
+        if y < MARGIN:
+            yield flush_page(lines)
+            lines, y = header_lines(len(page_ids) + 1)
+        x = MARGIN
+        for value, (_, width) in zip(row, columns):
+            lines.append(f"BT /F1 {FONT_SIZE} Tf {x} {y} Td ({_pdf_text(value, width)}) Tj ET")
+            x += width
+        y -= LINE
+        count += 1
+    lines.append(f"BT /F2 {FONT_SIZE} Tf {MARGIN} {y - 6} Td (Total students: {count}) Tj ET")
+    yield flush_page(lines)
+
+    kids = ' '.join(f"{p} 0 R" for p in page_ids)
+    yield out.obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode())
+    xref_at = out.offset
+    total = next_id
+    xref = [f"xref\n0 {total}\n", "0000000000 65535 f \n"]
+    xref += [f"{out.offsets[n]:010d} 00000 n \n" for n in range(1, total)]
+    yield out.emit(''.join(xref).encode())
+    yield out.emit(f"trailer\n<< /Size {total} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode())
+
+
+# ──────────────────────────────────────────────
+# BATCH (process pool)
+# ──────────────────────────────────────────────
+def _limit_memory(max_mb):
+    if resource and max_mb:
+        limit = max_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _write_course(db_path, course_id, academic_year, kind, formats, out_dir):
+    db = Database(db_path, init=False)
+    course = course_info(db, course_id)
+    written = []
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{course['dept_code']}_{course['course_code']}_{kind}.{fmt}")
+        if fmt == 'pdf':
+            with open(path, 'wb') as fh:
+                for chunk in pdf_chunks(db, course, academic_year, kind):
+                    fh.write(chunk)
+        else:
+            with open(path, 'w', encoding='utf-8') as fh:
+                for chunk in html_chunks(db, course, academic_year, kind):
+                    fh.write(chunk)
+        written.append(path)
+    return written
+
+
+def generate_all(db, academic_year, out_dir, dept_code=None, kind='marksheet',
+                 formats=('pdf',), workers=None, max_mb=256):
+    """Har course (optional: ek department) ki sheet - process pool me, har worker max_mb tak"""
+    os.makedirs(out_dir, exist_ok=True)
+    query = """
+        SELECT DISTINCT e.course_id FROM enrollments e
+        JOIN courses c ON e.course_id=c.course_id
+        JOIN departments d ON c.dept_id=d.dept_id
+        WHERE e.academic_year=?
+    """
+    params = [academic_year]
+    if dept_code:
+        query += " AND d.dept_code=?"
+        params.append(dept_code)
+    course_ids = [r['course_id'] for r in db.iter_rows(query, params)]
+    written = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_limit_memory,
+                             initargs=(max_mb,)) as pool:
+        futures = [pool.submit(_write_course, db.db_path, cid, academic_year, kind, formats, out_dir)
+                   for cid in course_ids]
+        for f in futures:
+            written.extend(f.result())
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate course rosters / mark sheets')
+    parser.add_argument('--year', required=True, help='Academic year, e.g. 2025-2026')
+    parser.add_argument('--dept', help='Department code (default: all)')
+    parser.add_argument('--kind', choices=list(KINDS), default='marksheet')
+    parser.add_argument('--format', choices=['pdf', 'html', 'both'], default='pdf')
+    parser.add_argument('--out', default='marksheets')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-mb', type=int, default=256, help='Per-worker memory ceiling')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite database file')
+    args = parser.parse_args(argv)
+
+    formats = ('pdf', 'html') if args.format == 'both' else (args.format,)
+    files = generate_all(Database(args.db, init=False), args.year, args.out, args.dept,
+                         args.kind, formats, args.workers, args.max_mb)
+    print(f"{len(files)} files written to {args.out}/")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+REQUEST PROFILER & QUERY BUDGETS
+================================
+PROFILE=1 set karo (development/staging) to har request ke liye:
+- Database se gaye har SQL statement ka time, row count aur EXPLAIN QUERY PLAN
+- Python side ka cProfile data (top functions) - ek waqt me ek hi request;
+  Python 3.12+ me do profilers saath enable nahi ho sakte, isliye concurrent
+  request ka sirf SQL record hota hai
+- HTML pages me neeche ek collapsible panel; PROFILE_DIR set ho to har
+  request ki .prof file (snakeviz / flameprof se flamegraph)
+- Per-route query/time budget - TESTING ya PROFILE_STRICT=1 me budget
+  cross hone par QueryBudgetExceeded raise hota hai (tests fail)
+"""
+
+import os
+import io
+import time
+import pstats
+import threading
+import cProfile
+from html import escape
+
+from flask import g, request, has_request_context
+
+DEFAULT_BUDGET = {'queries': 10, 'ms': 500}
+
+# Process me ek hi cProfile active ho sakta hai (3.12+: sys.monitoring tool id)
+_cprofile_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestProfiler:
+    def __init__(self, app, db, budgets=None, profile_dir=None, strict=False):
+        self.app = app
+        self.db = db
+        self.budgets = budgets or {}
+        self.profile_dir = profile_dir
+        self.strict = strict
+        db.profiler = self
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._stop)
+
+    # ── Database hook ───────────────────────────
+    def record(self, query, params, elapsed, rows):
+        if has_request_context() and 'profile_queries' in g:
+            g.profile_queries.append({
+                'sql':    ' '.join(query.split()),
+                'params': tuple(params),
+                'ms':     elapsed * 1000,
+                'rows':   rows,
+            })
+
+    # ── request lifecycle ───────────────────────
+    def _start(self):
+        g.profile_queries = []
+        g.profile_start = time.perf_counter()
+        g.profiler = None
+        # Doosri request profile ho rahi hai to wait nahi - is request ka sirf SQL
+        if not _cprofile_lock.acquire(blocking=False):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Koi aur tool (coverage/debugger) pehle se laga hai
+            _cprofile_lock.release()
+            return
+        g.profiler = profiler
+
+    def _stop(self, exc=None):
+        # View me exception aaye to bhi profiler band ho aur lock chhute
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _cprofile_lock.release()
+
+    def _finish(self, response):
+        if 'profile_start' not in g:
+            return response
+        if g.profiler is not None:
+            g.profiler.disable()
+        total_ms = (time.perf_counter() - g.profile_start) * 1000
+        queries = g.profile_queries
+        del g.profile_queries           # EXPLAIN wale queries record na hon
+
+        budget = dict(DEFAULT_BUDGET, **self.budgets.get(request.endpoint, {}))
+        over = []
+        if len(queries) > budget['queries']:
+            over.append(f"{len(queries)} queries > budget {budget['queries']}")
+        if total_ms > budget['ms']:
+            over.append(f"{total_ms:.0f} ms > budget {budget['ms']} ms")
+
+        if self.profile_dir and g.profiler is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            name = f"{int(time.time() * 1000)}_{request.endpoint or 'none'}.prof"
+            g.profiler.dump_stats(os.path.join(self.profile_dir, name))
+
+        if over:
+            msg = f"{request.method} {request.path} ({request.endpoint}): " + '; '.join(over)
+            if self.strict or self.app.testing:
+                raise QueryBudgetExceeded(msg)
+            self.app.logger.warning("Query budget exceeded - %s", msg)
+
+        if response.mimetype == 'text/html' and not response.is_streamed:
+            html = response.get_data(as_text=True)
+            if '</body>' in html:
+                panel = self._panel(queries, total_ms, budget, over)
+                response.set_data(html.replace('</body>', panel + '</body>', 1))
+        response.headers['X-Query-Count'] = str(len(queries))
+        response.headers['X-Response-Time-Ms'] = f"{total_ms:.1f}"
+        return response
+
+    # ── panel ───────────────────────────────────
+    def _explain(self, sql, params):
+        if not sql.lstrip().upper().startswith('SELECT'):
+            return ''
+        conn = self.db.get_connection()
+        try:
+            rows = conn.execute('EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+            return '\n'.join(r['detail'] for r in rows)
+        except Exception as e:
+            return f'explain failed: {e}'
+        finally:
+            conn.close()
+
+    def _python_stats(self, limit=15):
+        if g.profiler is None:
+            return 'cProfile busy (concurrent request) - sirf SQL record hua'
+        out = io.StringIO()
+        pstats.Stats(g.profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+    def _panel(self, queries, total_ms, budget, over):
+        sql_ms = sum(q['ms'] for q in queries)
+        rows = ''.join(f"""
+            <tr><td>{i}</td><td>{q['ms']:.2f}</td><td>{'' if q['rows'] is None else q['rows']}</td>
+                <td><code>{escape(q['sql'])}</code>
+                    <pre class="small text-muted mb-0">{escape(self._explain(q['sql'], q['params']))}</pre></td></tr>"""
+            for i, q in enumerate(queries, 1))
+        status = 'danger' if over else 'success'
+        return f"""
+<details class="position-fixed bottom-0 end-0 m-2 bg-white border rounded shadow"
+         style="z-index:2000; max-width:90vw; max-height:70vh; overflow:auto;">
+    <summary class="px-3 py-2 small fw-semibold text-{status}">
+        {len(queries)} queries / {sql_ms:.1f} ms SQL / {total_ms:.1f} ms total
+        (budget {budget['queries']} q, {budget['ms']} ms)
+    </summary>
+    <div class="p-2">
+        {''.join(f'<div class="alert alert-danger py-1 small">{escape(o)}</div>' for o in over)}
+        <table class="table table-sm small mb-2">
+            <thead><tr><th>#</th><th>ms</th><th>rows</th><th>SQL / query plan</th></tr></thead>
+            <tbody>{rows}</tbody>
+        </table>
+        <pre class="small">{escape(self._python_stats())}</pre>
+    </div>
+</details>
+"""
+
+
+def init_profiler(app, db, budgets=None):
+    """PROFILE=1 ho to profiler lagao, warna kuch nahi"""
+    if os.environ.get('PROFILE') != '1':
+        return None
+    return RequestProfiler(app, db, budgets,
+                           profile_dir=os.environ.get('PROFILE_DIR'),
+                           strict=os.environ.get('PROFILE_STRICT') == '1')
@@ -0,0 +1,161 @@
+"""
+RATE LIMITING & ADMISSION CONTROL
+=================================
+- TokenBucket / RateLimiter : per-IP aur per-user token buckets
+- WriteGate                 : write routes pe global concurrency cap + bounded wait queue
+Limit cross hone par turant 429 + Retry-After, taaki SQLite writer
+'database is locked' me na phas jaaye.
+"""
+
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, g, jsonify, make_response
+
+
+# ──────────────────────────────────────────────
+# TOKEN BUCKETS
+# ──────────────────────────────────────────────
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate            # tokens per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self, now=None):
+        """Token mila to 0, warna kitne seconds baad milega"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Key (IP / user) ke hisaab se buckets - bounded, purane keys LRU se hat jaate hain"""
+
+    def __init__(self, rate, capacity, max_keys=10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity)
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take()
+
+
+def limiter_from_env(name, rate, capacity):
+    """
+    {name}_RATE (tokens/sec) aur {name}_BURST env se override.
+    RATE=0 ho to limiter band (None) - decorator us bucket ko skip karta hai.
+    """
+    rate = float(os.environ.get(f'{name}_RATE', rate))
+    capacity = int(os.environ.get(f'{name}_BURST', capacity))
+    return RateLimiter(rate, capacity) if rate > 0 else None
+
+
+# ──────────────────────────────────────────────
+# WRITE GATE
+# ──────────────────────────────────────────────
+class WriteGate:
+    """
+    Ek time pe max_concurrent writes; baaki max_waiting tak queue me
+    wait karte hain (timeout seconds tak). Queue full ho to turant reject.
+    """
+
+    def __init__(self, max_concurrent=2, max_waiting=32, timeout=2.0):
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self._slots.acquire(blocking=False):
+            return True
+        with self._lock:
+            if self._waiting >= self.max_waiting:
+                return False
+            self._waiting += 1
+        try:
+            return self._slots.acquire(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def release(self):
+        self._slots.release()
+
+
+# ──────────────────────────────────────────────
+# FLASK HELPERS
+# ──────────────────────────────────────────────
+def client_ip():
+    # Proxy ke peeche sahi IP ke liye TRUSTED_PROXIES set karo (app.py ProxyFix lagata hai)
+    return request.remote_addr or 'unknown'
+
+def too_many_requests(retry_after):
+    retry_after = max(1, math.ceil(retry_after))
+    msg = 'Too many requests, please retry later.'
+    if request.path.startswith('/api/'):
+        resp = make_response(jsonify({'error': msg, 'retry_after': retry_after}), 429)
+    else:
+        resp = make_response(msg, 429)
+    resp.headers['Retry-After'] = str(retry_after)
+    return resp
+
+def rate_limit(ip_limiter=None, user_limiter=None, user_key=None, methods=None):
+    """
+    ip_limiter   : client IP pe bucket
+    user_limiter : user pe bucket - user_key() se key (default g.user ka user_id)
+    methods      : sirf in methods pe limit (None = sab)
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if methods is None or request.method in methods:
+                if ip_limiter:
+                    wait = ip_limiter.hit(client_ip())
+                    if wait:
+                        return too_many_requests(wait)
+                if user_limiter:
+                    key = user_key() if user_key else getattr(g, 'user', {}).get('user_id')
+                    if key:
+                        wait = user_limiter.hit(key)
+                        if wait:
+                            return too_many_requests(wait)
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def write_admission(gate, methods=None):
+    """Write route ko gate ke peeche chalao; slot na mile to 429"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if methods is not None and request.method not in methods:
+                return f(*args, **kwargs)
+            if not gate.acquire():
+                return too_many_requests(gate.timeout)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                gate.release()
+        return wrapper
+    return decorator
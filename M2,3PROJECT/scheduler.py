@@ -0,0 +1,365 @@
+"""
+TIMETABLE & WORKLOAD SCHEDULER
+==============================
+faculty_courses assignments + enrollments se clash-free timetable banata hai:
+- Har course ke sections (enrolled students / room capacity ke hisaab se)
+- Har section ki weekly meetings = course credits
+- Slot occupancy bitsets (int) me: faculty, room aur har section ka ek mask,
+  isliye clash check sirf ek AND operation hai
+- Most-constrained section pehle (DSatur jaisa greedy)
+Result (academic_year, semester) ke hisaab se cache hota hai; ek assignment
+badle to sirf us course ke sections dobara place hote hain.
+"""
+
+import re
+import copy
+import math
+import threading
+from collections import OrderedDict
+
+DAYS    = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']
+PERIODS = ['09:00', '10:00', '11:00', '12:00', '14:00', '15:00']
+NUM_SLOTS = len(DAYS) * len(PERIODS)
+DAY_MASKS = [((1 << len(PERIODS)) - 1) << (d * len(PERIODS)) for d in range(len(DAYS))]
+
+
+def valid_academic_year(value):
+    """'2025-2026' jaisa YYYY-YYYY hi chalega"""
+    return bool(re.fullmatch(r'\d{4}-\d{4}', value or ''))
+
+
+def slot_label(slot):
+    return DAYS[slot // len(PERIODS)], PERIODS[slot % len(PERIODS)]
+
+
+class Section:
+    __slots__ = ('key', 'course', 'number', 'faculty_id', 'students', 'size', 'meetings',
+                 'neighbors', 'mask', 'placements')
+
+    def __init__(self, course, number, faculty_id, students):
+        self.key = (course['course_id'], number)
+        self.course = course
+        self.number = number
+        self.faculty_id = faculty_id
+        self.students = students
+        self.size = len(students)
+        self.meetings = course['credits']
+        self.neighbors = []         # student clash wale sections
+        self.mask = 0               # is section ke occupied slots
+        self.placements = []        # [(slot, room_id)]
+
+
+class Timetable:
+    def __init__(self, db, academic_year, semester):
+        self.db = db
+        self.academic_year = academic_year
+        self.semester = semester
+        self.solve()
+
+    # ── inputs ──────────────────────────────────
+    def _load(self, course_id=None):
+        query = """
+            SELECT fc.faculty_id, c.course_id, c.course_code, c.course_name,
+                   c.credits, c.dept_id, c.semester as course_semester,
+                   f.first_name||' '||f.last_name as faculty_name
+            FROM faculty_courses fc
+            JOIN courses c ON fc.course_id=c.course_id
+            JOIN faculty f ON fc.faculty_id=f.faculty_id
+            WHERE fc.academic_year=? AND fc.semester=?
+        """
+        params = [self.academic_year, self.semester]
+        if course_id is not None:
+            query += " AND fc.course_id=?"
+            params.append(course_id)
+        rows = self.db.fetch_all(query + " ORDER BY c.course_id, fc.faculty_id", params)
+
+        courses = {}
+        for r in rows:
+            c = courses.setdefault(r['course_id'], dict(r, faculty=[]))
+            if r['faculty_id'] not in c['faculty']:
+                c['faculty'].append(r['faculty_id'])
+            self.faculty_names[r['faculty_id']] = r['faculty_name']
+        return courses
+
+    def _load_students(self):
+        students = {}
+        for r in self.db.fetch_all(
+            "SELECT course_id, student_id FROM enrollments WHERE academic_year=? AND semester=?",
+            (self.academic_year, self.semester)
+        ):
+            students.setdefault(r['course_id'], set()).add(r['student_id'])
+        return students
+
+    def _make_sections(self, course):
+        # Students ko sorted student_id ke chunks me baanto - ek hi batch ke
+        # courses me section k ke students same rehte hain
+        enrolled = sorted(self.students.get(course['course_id'], ()))
+        biggest = max((r['capacity'] for r in self.rooms), default=0)
+        splits = math.ceil(len(enrolled) / biggest) if biggest else 1
+        count = max(1, splits, len(course['faculty']))
+        size = math.ceil(len(enrolled) / count) if enrolled else 0
+        return [Section(course, n + 1, course['faculty'][n % len(course['faculty'])],
+                        frozenset(enrolled[n * size:(n + 1) * size]))
+                for n in range(count)]
+
+    def _link(self, section):
+        """Student clash wale sections jodo - student index se, saare pairs nahi"""
+        course = section.course
+        if section.students:
+            candidates = set()
+            for sid in section.students:
+                candidates.update(self._by_student.get(sid, ()))
+            for sid in section.students:
+                self._by_student.setdefault(sid, []).append(section)
+        else:
+            # Enrollment data nahi - same dept+semester batch ko clash maano
+            cohort = (course['dept_id'], course['course_semester'])
+            candidates = set(self._by_cohort.get(cohort, ()))
+            self._by_cohort.setdefault(cohort, []).append(section)
+        for other in candidates:
+            if other.course['course_id'] != course['course_id']:
+                section.neighbors.append(other)
+                other.neighbors.append(section)
+
+    # ── solver ──────────────────────────────────
+    def solve(self):
+        self.faculty_names = {}
+        self.rooms = self.db.fetch_all("SELECT * FROM rooms ORDER BY capacity, room_code")
+        self.students = self._load_students()
+        self.courses = self._load()
+        self.sections = []
+        self._by_student = {}
+        self._by_cohort = {}
+        for course in self.courses.values():
+            for section in self._make_sections(course):
+                self._link(section)
+                self.sections.append(section)
+        self.faculty_busy = {}
+        self.room_busy = {r['room_id']: 0 for r in self.rooms}
+        self.unscheduled = []
+        order = sorted(self.sections,
+                       key=lambda s: (len(s.neighbors) * s.meetings, s.meetings, s.size),
+                       reverse=True)
+        for section in order:
+            self._place(section)
+
+    def _place(self, section):
+        for _ in range(section.meetings - len(section.placements)):
+            blocked = section.mask | self.faculty_busy.get(section.faculty_id, 0)
+            for other in section.neighbors:
+                blocked |= other.mask
+            if not self._place_one(section, blocked):
+                self.unscheduled.append(section)
+                return False
+        return True
+
+    def _place_one(self, section, blocked):
+        # Jis din section ki class nahi hai wo din pehle, phir sabse khaali din
+        faculty_mask = self.faculty_busy.get(section.faculty_id, 0)
+        days = sorted(range(len(DAYS)), key=lambda d: (
+            bool(section.mask & DAY_MASKS[d]),
+            bin(faculty_mask & DAY_MASKS[d]).count('1'),
+        ))
+        for d in days:
+            free = DAY_MASKS[d] & ~blocked
+            while free:
+                bit = free & -free
+                free ^= bit
+                room = self._free_room(bit, section.size)
+                if room is not None:
+                    slot = bit.bit_length() - 1
+                    section.mask |= bit
+                    self.faculty_busy[section.faculty_id] = self.faculty_busy.get(section.faculty_id, 0) | bit
+                    self.room_busy[room] |= bit
+                    section.placements.append((slot, room))
+                    return True
+        return False
+
+    def _free_room(self, bit, size):
+        # rooms capacity ke order me hain - sabse chhota fit hone wala room
+        for r in self.rooms:
+            if r['capacity'] >= size and not self.room_busy[r['room_id']] & bit:
+                return r['room_id']
+        return None
+
+    def _unplace(self, section):
+        for slot, room in section.placements:
+            bit = 1 << slot
+            self.faculty_busy[section.faculty_id] &= ~bit
+            self.room_busy[room] &= ~bit
+        section.mask = 0
+        section.placements = []
+
+    # ── incremental update ──────────────────────
+    def copy(self):
+        """
+        Deep copy (db share hota hai) - TimetableCache update isi pe karta hai,
+        taaki render kar rahe readers ke paas purana poora timetable rahe
+        """
+        memo = {id(self.db): self.db}
+        # Student sets immutable hain - copy karne ki zaroorat nahi
+        for section in self.sections:
+            memo[id(section.students)] = section.students
+        return copy.deepcopy(self, memo)
+
+    def update_course(self, course_id):
+        """Ek course ka assignment badla - sirf uske sections dobara place karo"""
+        old = [s for s in self.sections if s.course['course_id'] == course_id]
+        for section in old:
+            self._unplace(section)
+            for other in section.neighbors:
+                other.neighbors.remove(section)
+            for sid in section.students:
+                self._by_student[sid].remove(section)
+            cohort = (section.course['dept_id'], section.course['course_semester'])
+            if section in self._by_cohort.get(cohort, ()):
+                self._by_cohort[cohort].remove(section)
+        self.sections = [s for s in self.sections if s.course['course_id'] != course_id]
+        self.unscheduled = [s for s in self.unscheduled if s.course['course_id'] != course_id]
+        self.courses.pop(course_id, None)
+
+        self.courses.update(self._load(course_id))
+        course = self.courses.get(course_id)
+        if course is None:
+            return True
+        new = self._make_sections(course)
+        for section in new:
+            self._link(section)
+            self.sections.append(section)
+        if not all(self._place(s) for s in new):
+            # Incremental place nahi hua - poora timetable dobara solve karo
+            self.solve()
+        return not self.unscheduled
+
+    # ── output ──────────────────────────────────
+    def grid(self):
+        """grid[period][day] = list of entries"""
+        room_codes = {r['room_id']: r['room_code'] for r in self.rooms}
+        grid = [[[] for _ in DAYS] for _ in PERIODS]
+        for section in self.sections:
+            for slot, room in section.placements:
+                grid[slot % len(PERIODS)][slot // len(PERIODS)].append({
+                    'course_code': section.course['course_code'],
+                    'section':     section.number,
+                    'room':        room_codes[room],
+                    'faculty':     self.faculty_names.get(section.faculty_id, ''),
+                })
+        return grid
+
+    def workload(self):
+        load = {}
+        for section in self.sections:
+            w = load.setdefault(section.faculty_id, {
+                'faculty_id': section.faculty_id,
+                'faculty':    self.faculty_names.get(section.faculty_id, ''),
+                'courses':    set(),
+                'sections':   0,
+                'hours':      0,
+            })
+            w['courses'].add(section.course['course_code'])
+            w['sections'] += 1
+            w['hours'] += len(section.placements)
+        for w in load.values():
+            w['courses'] = ', '.join(sorted(w['courses']))
+        return sorted(load.values(), key=lambda w: -w['hours'])
+
+    def unscheduled_sections(self):
+        return [{'course_code': s.course['course_code'], 'section': s.number,
+                 'missing': s.meetings - len(s.placements)} for s in self.unscheduled]
+
+
+class TimetableCache:
+    """
+    (academic_year, semester) -> Timetable, LRU - max_entries se zyada nahi.
+    Solve sirf usi key ke lock ke andar hota hai, doosre semesters wait nahi karte.
+
+    shared (SharedCache/LocalCache) ke generation counters se multi-worker me
+    sab workers sync rehte hain: koi worker assignment/enrollment badle to
+    counter bump hota hai, baaki workers agli request pe dobara solve karte hain.
+    """
+
+    def __init__(self, db, shared=None, max_entries=16):
+        self.db = db
+        self.shared = shared
+        self.max_entries = max_entries
+        self._cache = OrderedDict()     # key -> (Timetable, version)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _counter_name(key):
+        return f"timetable:{key[0]}:{key[1]}"
+
+    def _version(self, key):
+        """(global, per-key) generation; None = shared cache se pata nahi chala"""
+        if self.shared is None:
+            return None
+        version = (self.shared.counter('timetable'), self.shared.counter(self._counter_name(key)))
+        return None if None in version else version
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key, version):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if version is not None and entry[1] != version:
+                del self._cache[key]    # kisi aur worker ne badla - stale
+                return None
+            self._cache.move_to_end(key)
+            return entry[0]
+
+    def _store(self, key, tt, version):
+        with self._lock:
+            self._cache[key] = (tt, version)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                old, _ = self._cache.popitem(last=False)
+                self._key_locks.pop(old, None)
+
+    def get(self, academic_year, semester):
+        key = (academic_year, semester)
+        # Version solve se pehle padho - solve ke dauraan change aaye to agli baar rebuild
+        version = self._version(key)
+        tt = self._lookup(key, version)
+        if tt is not None:
+            return tt
+        with self._key_lock(key):
+            tt = self._lookup(key, version)     # doosre thread ne abhi solve kiya ho
+            if tt is None:
+                tt = Timetable(self.db, academic_year, semester)
+                self._store(key, tt, version)
+            return tt
+
+    def update_course(self, academic_year, semester, course_id):
+        key = (academic_year, semester)
+        with self._key_lock(key):
+            old = self._version(key)
+            new = self.shared.bump(self._counter_name(key)) if self.shared else None
+            tt = self._lookup(key, old)
+            if tt is None:
+                return
+            if self.shared is None or (old is not None and new == old[1] + 1):
+                # Beech me kisi aur ne kuch nahi badla - incremental update kaafi hai.
+                # Copy pe update, phir swap - cached object kabhi half-updated nahi dikhta
+                updated = tt.copy()
+                updated.update_course(course_id)
+                self._store(key, updated, (old[0], new) if self.shared else None)
+            else:
+                self.invalidate(academic_year, semester, notify=False)
+
+    def invalidate(self, academic_year=None, semester=None, notify=True):
+        with self._lock:
+            if academic_year is None:
+                self._cache.clear()
+            else:
+                self._cache.pop((academic_year, semester), None)
+        if notify and self.shared is not None:
+            name = 'timetable' if academic_year is None else self._counter_name((academic_year, semester))
+            self.shared.bump(name)
+
+    def __len__(self):
+        return len(self._cache)
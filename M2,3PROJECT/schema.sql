@@ -94,6 +94,8 @@ CREATE TABLE IF NOT EXISTS enrollments (
     FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
     FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE
 );
+-- Course-wise roster / mark sheet ke liye
+CREATE INDEX IF NOT EXISTS idx_enrollments_roster ON enrollments(course_id, academic_year, student_id);
 
 -- ============================================================
 -- 7. GRADES TABLE (3NF - grade points in separate lookup)
@@ -155,6 +157,80 @@ CREATE TABLE IF NOT EXISTS users (
     created_at    TEXT DEFAULT (datetime('now'))
 );
 
+-- ============================================================
+-- 11. ROOMS TABLE (for timetable scheduler)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS rooms (
+    room_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_code     TEXT NOT NULL UNIQUE,
+    capacity      INTEGER NOT NULL CHECK(capacity > 0)
+);
+
+-- ============================================================
+-- 12. CHANGE LOG (change-data-capture, /api/changes)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS change_log (
+    seq           INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name    TEXT NOT NULL,
+    op            TEXT NOT NULL,
+    row_id        INTEGER NOT NULL,
+    changed_at    TEXT DEFAULT (datetime('now'))
+);
+CREATE INDEX IF NOT EXISTS idx_change_log_row ON change_log(table_name, row_id);
+
+-- Har INSERT/UPDATE/DELETE change_log me ek entry likhta hai
+CREATE TRIGGER IF NOT EXISTS cdc_students_insert AFTER INSERT ON students
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('students', 'INSERT', NEW.student_id);
+END;
+CREATE TRIGGER IF NOT EXISTS cdc_students_update AFTER UPDATE ON students
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('students', 'UPDATE', NEW.student_id);
+END;
+CREATE TRIGGER IF NOT EXISTS cdc_students_delete AFTER DELETE ON students
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('students', 'DELETE', OLD.student_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cdc_enrollments_insert AFTER INSERT ON enrollments
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('enrollments', 'INSERT', NEW.enrollment_id);
+END;
+CREATE TRIGGER IF NOT EXISTS cdc_enrollments_update AFTER UPDATE ON enrollments
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('enrollments', 'UPDATE', NEW.enrollment_id);
+END;
+CREATE TRIGGER IF NOT EXISTS cdc_enrollments_delete AFTER DELETE ON enrollments
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('enrollments', 'DELETE', OLD.enrollment_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cdc_grades_insert AFTER INSERT ON grades
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('grades', 'INSERT', NEW.grade_id);
+END;
+CREATE TRIGGER IF NOT EXISTS cdc_grades_update AFTER UPDATE ON grades
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('grades', 'UPDATE', NEW.grade_id);
+END;
+CREATE TRIGGER IF NOT EXISTS cdc_grades_delete AFTER DELETE ON grades
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('grades', 'DELETE', OLD.grade_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cdc_faculty_insert AFTER INSERT ON faculty
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('faculty', 'INSERT', NEW.faculty_id);
+END;
+CREATE TRIGGER IF NOT EXISTS cdc_faculty_update AFTER UPDATE ON faculty
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('faculty', 'UPDATE', NEW.faculty_id);
+END;
+CREATE TRIGGER IF NOT EXISTS cdc_faculty_delete AFTER DELETE ON faculty
+BEGIN
+    INSERT INTO change_log (table_name, op, row_id) VALUES ('faculty', 'DELETE', OLD.faculty_id);
+END;
+
 -- ============================================================
 -- SEED DATA - Grade Lookup
 -- ============================================================
@@ -173,6 +249,11 @@ INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name) VALUES
     ('Electronics', 'EC', 'Dr. Suresh Patel'),
     ('Mechanical Engineering', 'ME', 'Dr. Anjali Singh');
 
+-- SEED DATA - Rooms
+INSERT OR IGNORE INTO rooms (room_code, capacity) VALUES
+    ('R101', 60), ('R102', 60), ('R201', 60), ('R202', 40),
+    ('LH-1', 120), ('LH-2', 120);
+
 -- SEED DATA - Admin User (password: admin123)
 INSERT OR IGNORE INTO users (username, password_hash, role) VALUES
     ('admin', 'pbkdf2:sha256:260000$admin123hashed', 'admin');
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+MULTI-PROCESS HELPERS
+=====================
+Pre-fork workers (gunicorn -w N) ke liye:
+- SharedCache : SQLite-backed cache jo saare worker processes dekhte hain
+                (stats, lookups) - har worker apna connection lazily kholta hai.
+                Generation counters bhi (bump/counter) - ek worker kuch badle
+                to baaki workers apni in-process copy (timetable) dobara banate hain
+- LocalCache  : same interface, sirf process ke andar (single worker, dev server)
+- WriterLock  : cross-process file lock - ek time pe sirf ek process SQLite
+                me likhta hai, baaki lock pe wait karte hain (busy-retry nahi)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+try:
+    import fcntl
+except ImportError:             # Windows - file lock nahi, SQLite ka busy timeout hi sahi
+    fcntl = None
+
+
+class SharedCache:
+    def __init__(self, db_path, default_ttl=5):
+        self.db_path = db_path
+        self.default_ttl = default_ttl
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key     TEXT PRIMARY KEY,
+                value   TEXT NOT NULL,
+                expires REAL NOT NULL
+            )
+        """)
+        # clear() isse nahi chhoota - counters har write pe reset nahi hone chahiye
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS counters (
+                name  TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        conn.commit()
+
+    def _connect(self):
+        # Connection per (process, thread) - fork ke baad naya khulta hai
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")      # cache hai, crash pe kho jaaye to chalega
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM cache WHERE key=? AND expires>=?", (key, time.time())
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None         # cache na mile to caller compute kar lega
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?,?,?)",
+                (key, json.dumps(value), time.time() + (ttl or self.default_ttl))
+            )
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass                # cache write fail ho to request fail nahi honi chahiye
+
+    def get_or_set(self, key, compute, ttl=None):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def _write(self, query, params=()):
+        conn = self._connect()
+        try:
+            conn.execute(query, params)
+            conn.commit()
+        except sqlite3.OperationalError:
+            conn.rollback()     # set() jaisa - cache ki wajah se write fail nahi dikhna chahiye
+
+    def delete(self, key):
+        self._write("DELETE FROM cache WHERE key=?", (key,))
+
+    def clear(self):
+        self._write("DELETE FROM cache")
+
+    def counter(self, name):
+        """Generation counter ki current value (kabhi bump nahi hua to 0, error pe None)"""
+        try:
+            row = self._connect().execute("SELECT value FROM counters WHERE name=?", (name,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else 0
+
+    def bump(self, name):
+        """Counter +1, nayi value return - saare workers ko pata chal jaata hai"""
+        conn = self._connect()
+        try:
+            conn.execute("""
+                INSERT INTO counters (name, value) VALUES (?, 1)
+                ON CONFLICT(name) DO UPDATE SET value=value+1
+            """, (name,))
+            value = conn.execute("SELECT value FROM counters WHERE name=?", (name,)).fetchone()[0]
+            conn.commit()
+            return value
+        except sqlite3.OperationalError:
+            conn.rollback()
+            return None
+
+
+class LocalCache:
+    """SharedCache jaisa interface, process-local dict - cache.db pe extra commit nahi"""
+
+    def __init__(self, default_ttl=5):
+        self.default_ttl = default_ttl
+        self._data = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[1] < time.time():
+            return None
+        return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, time.time() + (ttl or self.default_ttl))
+
+    def get_or_set(self, key, compute, ttl=None):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def counter(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def bump(self, name):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+            return self._counters[name]
+
+
+class WriterLock:
+    """fcntl.flock based exclusive lock - process ke andar threads ke liye bhi safe"""
+
+    def __init__(self, lock_path):
+        self.lock_path = lock_path
+        self._thread_lock = threading.Lock()
+        self._fd = None
+        self._pid = None
+
+    def _file(self):
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if fcntl:
+            fcntl.flock(self._file(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self._file(), fcntl.LOCK_UN)
+        self._thread_lock.release()
+        return False
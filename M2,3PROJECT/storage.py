@@ -0,0 +1,311 @@
+"""
+DATABASE LAYER
+==============
+Database class + hash_password. Alag module me taaki marksheets workers aur
+benchmark scripts ise import kar sakein bina poora Flask app (init_db,
+sessions, assets) chalaye - import karne se koi side effect nahi.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+from contextlib import nullcontext
+
+from cdc import cdc_schema_sql
+from groupcommit import GroupCommitWriter
+
+
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+# ──────────────────────────────────────────────
+# DATABASE CLASS
+# ──────────────────────────────────────────────
+class Database:
+    def __init__(self, db_path, group_commit=False, writer_lock=None, cache=None, init=True, wal=False):
+        self.db_path = db_path
+        self.group_commit = group_commit
+        self.wal = wal                      # sirf multi-worker (gunicorn) me
+        self.writer_lock = writer_lock      # multi-process: ek time pe ek writer
+        self.cache = cache                  # har write ke baad clear hota hai
+        self.profiler = None                # PROFILE=1 me har query record hoti hai
+        self._writer = None
+        self._writer_pid = None
+        if init:
+            self.init_db()
+
+    @property
+    def writer(self):
+        """Group commit writer thread - fork ke baad har process apna banata hai"""
+        if not self.group_commit:
+            return None
+        if self._writer is None or self._writer_pid != os.getpid():
+            self._writer = GroupCommitWriter(self.db_path, lock=self.writer_lock)
+            self._writer_pid = os.getpid()
+        return self._writer
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def init_db(self):
+        """Database aur tables banao - schema.sql ki zaroorat nahi"""
+        try:
+            # Database folder automatically banao
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+
+            conn = self.get_connection()
+            # WAL: readers writer ko block nahi karte (multi-process ke liye zaroori).
+            # Ye file me persist hota hai, isliye default off
+            if self.wal:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS departments (
+                    dept_id    INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dept_name  TEXT NOT NULL UNIQUE,
+                    dept_code  TEXT NOT NULL UNIQUE,
+                    hod_name   TEXT,
+                    created_at TEXT DEFAULT (datetime('now'))
+                );
+
+                CREATE TABLE IF NOT EXISTS courses (
+                    course_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+                    course_name TEXT NOT NULL,
+                    course_code TEXT NOT NULL UNIQUE,
+                    credits     INTEGER NOT NULL,
+                    dept_id     INTEGER NOT NULL,
+                    semester    INTEGER NOT NULL,
+                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
+                );
+
+                CREATE TABLE IF NOT EXISTS students (
+                    student_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+                    enrollment_no  TEXT NOT NULL UNIQUE,
+                    first_name     TEXT NOT NULL,
+                    last_name      TEXT NOT NULL,
+                    email          TEXT NOT NULL UNIQUE,
+                    phone          TEXT,
+                    dob            TEXT,
+                    gender         TEXT,
+                    dept_id        INTEGER NOT NULL,
+                    semester       INTEGER NOT NULL,
+                    admission_year INTEGER NOT NULL,
+                    status         TEXT DEFAULT 'Active',
+                    created_at     TEXT DEFAULT (datetime('now')),
+                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
+                );
+
+                CREATE TABLE IF NOT EXISTS student_addresses (
+                    address_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id INTEGER NOT NULL UNIQUE,
+                    street     TEXT,
+                    city       TEXT,
+                    state      TEXT,
+                    pincode    TEXT,
+                    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE
+                );
+
+                CREATE TABLE IF NOT EXISTS faculty (
+                    faculty_id    INTEGER PRIMARY KEY AUTOINCREMENT,
+                    faculty_code  TEXT NOT NULL UNIQUE,
+                    first_name    TEXT NOT NULL,
+                    last_name     TEXT NOT NULL,
+                    email         TEXT NOT NULL UNIQUE,
+                    phone         TEXT,
+                    qualification TEXT,
+                    designation   TEXT,
+                    dept_id       INTEGER NOT NULL,
+                    joining_date  TEXT,
+                    status        TEXT DEFAULT 'Active',
+                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
+                );
+
+                CREATE TABLE IF NOT EXISTS enrollments (
+                    enrollment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    student_id    INTEGER NOT NULL,
+                    course_id     INTEGER NOT NULL,
+                    academic_year TEXT NOT NULL,
+                    semester      INTEGER NOT NULL,
+                    enrolled_on   TEXT DEFAULT (datetime('now')),
+                    UNIQUE(student_id, course_id, academic_year),
+                    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+                    FOREIGN KEY (course_id)  REFERENCES courses(course_id)  ON DELETE CASCADE
+                );
+
+                CREATE TABLE IF NOT EXISTS grade_lookup (
+                    grade       TEXT PRIMARY KEY,
+                    grade_point REAL NOT NULL,
+                    min_marks   INTEGER NOT NULL,
+                    max_marks   INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS grades (
+                    grade_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+                    enrollment_id  INTEGER NOT NULL UNIQUE,
+                    marks_obtained INTEGER,
+                    grade          TEXT,
+                    remarks        TEXT,
+                    recorded_on    TEXT DEFAULT (datetime('now')),
+                    FOREIGN KEY (enrollment_id) REFERENCES enrollments(enrollment_id) ON DELETE CASCADE
+                );
+
+                CREATE TABLE IF NOT EXISTS faculty_courses (
+                    assign_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+                    faculty_id    INTEGER NOT NULL,
+                    course_id     INTEGER NOT NULL,
+                    academic_year TEXT NOT NULL,
+                    semester      INTEGER NOT NULL,
+                    FOREIGN KEY (faculty_id) REFERENCES faculty(faculty_id) ON DELETE CASCADE,
+                    FOREIGN KEY (course_id)  REFERENCES courses(course_id)  ON DELETE CASCADE
+                );
+
+                CREATE TABLE IF NOT EXISTS rooms (
+                    room_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+                    room_code TEXT NOT NULL UNIQUE,
+                    capacity  INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username      TEXT NOT NULL UNIQUE,
+                    password_hash TEXT NOT NULL,
+                    role          TEXT NOT NULL,
+                    ref_id        INTEGER,
+                    is_active     INTEGER DEFAULT 1,
+                    created_at    TEXT DEFAULT (datetime('now'))
+                );
+
+                -- Roster/mark sheet: student_id order index se hi aata hai, sort nahi
+                DROP INDEX IF EXISTS idx_enrollments_course;
+                CREATE INDEX IF NOT EXISTS idx_enrollments_roster
+                    ON enrollments(course_id, academic_year, student_id);
+
+                INSERT OR IGNORE INTO grade_lookup VALUES ('O',  10.0, 90, 100);
+                INSERT OR IGNORE INTO grade_lookup VALUES ('A+',  9.0, 80,  89);
+                INSERT OR IGNORE INTO grade_lookup VALUES ('A',   8.0, 70,  79);
+                INSERT OR IGNORE INTO grade_lookup VALUES ('B+',  7.0, 60,  69);
+                INSERT OR IGNORE INTO grade_lookup VALUES ('B',   6.0, 50,  59);
+                INSERT OR IGNORE INTO grade_lookup VALUES ('C',   5.0, 40,  49);
+                INSERT OR IGNORE INTO grade_lookup VALUES ('F',   0.0,  0,  39);
+
+                INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name)
+                    VALUES ('Computer Science', 'CS', 'Dr. Ramesh Kumar');
+                INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name)
+                    VALUES ('Information Technology', 'IT', 'Dr. Priya Sharma');
+                INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name)
+                    VALUES ('Electronics', 'EC', 'Dr. Suresh Patel');
+                INSERT OR IGNORE INTO departments (dept_name, dept_code, hod_name)
+                    VALUES ('Mechanical Engineering', 'ME', 'Dr. Anjali Singh');
+
+                -- Sirf khaali table me seed (INSERT OR IGNORE har startup pe
+                -- sqlite_sequence badha kar DB file likhta hai)
+                INSERT INTO rooms (room_code, capacity)
+                    SELECT * FROM (VALUES ('R101', 60), ('R102', 60), ('R201', 60),
+                                          ('R202', 40), ('LH-1', 120), ('LH-2', 120))
+                    WHERE NOT EXISTS (SELECT 1 FROM rooms);
+            """)
+            # Change-data-capture log + triggers
+            conn.executescript(cdc_schema_sql())
+            conn.commit()
+            conn.close()
+            self.create_admin_user()
+        except Exception as e:
+            raise Exception(f"Database init error: {e}")
+
+    def create_admin_user(self):
+        conn = self.get_connection()
+        try:
+            pwd_hash = hash_password('admin123')
+            conn.execute(
+                "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?,?,?)",
+                ('admin', pwd_hash, 'admin')
+            )
+            conn.commit()
+        except Exception as e:
+            print(f"Warning: {e}")
+        finally:
+            conn.close()
+
+    def execute_query(self, query, params=()):
+        start = time.perf_counter()
+        try:
+            if self.writer:
+                result = self.writer.submit(query, params)
+            else:
+                result = self._execute(query, params)
+        finally:
+            if self.profiler:
+                self.profiler.record(query, params, time.perf_counter() - start, None)
+        # Sirf successful write ke baad - cache errors khud swallow karta hai
+        if self.cache:
+            self.cache.clear()
+        return result
+
+    def _execute(self, query, params):
+        conn = self.get_connection()
+        try:
+            with self.writer_lock or nullcontext():
+                cur = conn.execute(query, params)
+                conn.commit()
+            return cur.lastrowid
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Data conflict: {e}")
+        except sqlite3.Error as e:
+            raise Exception(f"DB Error: {e}")
+        finally:
+            conn.close()
+
+    def fetch_all(self, query, params=()):
+        conn = self.get_connection()
+        start = time.perf_counter()
+        try:
+            cur = conn.execute(query, params)
+            rows = [dict(row) for row in cur.fetchall()]
+            if self.profiler:
+                self.profiler.record(query, params, time.perf_counter() - start, len(rows))
+            return rows
+        except sqlite3.Error as e:
+            raise Exception(f"Fetch error: {e}")
+        finally:
+            conn.close()
+
+    def iter_rows(self, query, params=(), batch_size=500):
+        """Bade result sets ke liye - rows batches me aate hain, poori list memory me nahi"""
+        conn = self.get_connection()
+        start = time.perf_counter()
+        count = 0
+        try:
+            cur = conn.execute(query, params)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    count += 1
+                    yield dict(row)
+        except sqlite3.Error as e:
+            raise Exception(f"Fetch error: {e}")
+        finally:
+            conn.close()
+            if self.profiler:
+                self.profiler.record(query, params, time.perf_counter() - start, count)
+
+    def fetch_one(self, query, params=()):
+        conn = self.get_connection()
+        start = time.perf_counter()
+        try:
+            cur = conn.execute(query, params)
+            row = cur.fetchone()
+            if self.profiler:
+                self.profiler.record(query, params, time.perf_counter() - start, 1 if row else 0)
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            raise Exception(f"Fetch error: {e}")
+        finally:
+            conn.close()
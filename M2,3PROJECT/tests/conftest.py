@@ -0,0 +1,34 @@
+import os
+import sys
+import importlib
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """app PROFILE=1 ke saath, temp DATA_DIR pe - committed database/ ko nahi chhoota"""
+    env = {'DATA_DIR': str(tmp_path_factory.mktemp('data')), 'PROFILE': '1'}
+    old = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    sys.modules.pop('app', None)
+    module = importlib.import_module('app')
+    module.app.testing = True
+    yield module
+    for k, v in old.items():
+        if v is None:
+            os.environ.pop(k, None)
+        else:
+            os.environ[k] = v
+
+
+@pytest.fixture
+def client(app_module):
+    # Har test fresh login karta hai - per-username login bucket khaali na ho jaye
+    app_module.auth_user_limiter._buckets.pop('admin', None)
+    client = app_module.app.test_client()
+    resp = client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    assert resp.status_code == 302
+    return client
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from auth import UserCache
+from storage import hash_password
+
+
+@pytest.fixture
+def student(app_module):
+    db = app_module.db
+    username = f"stu{len(db.fetch_all('SELECT user_id FROM users'))}"
+    user_id = db.execute_query(
+        "INSERT INTO users (username, password_hash, role) VALUES (?,?,?)",
+        (username, hash_password('secret1'), 'student')
+    )
+    client = app_module.app.test_client()
+    resp = client.post('/login', data={'username': username, 'password': 'secret1'})
+    assert resp.status_code == 302 and '/dashboard' in resp.headers['Location']
+    return user_id, client
+
+
+def test_deactivated_user_session_ends(app_module, student):
+    user_id, client = student
+    assert client.get('/dashboard').status_code == 200
+    app_module.db.execute_query("UPDATE users SET is_active=0 WHERE user_id=?", (user_id,))
+    app_module.user_cache.invalidate(user_id=user_id)
+    resp = client.get('/dashboard')
+    assert resp.status_code == 302 and '/login' in resp.headers['Location']
+    # Session server-side se bhi gaya - dobara activate karne par bhi purana cookie nahi chalega
+    app_module.db.execute_query("UPDATE users SET is_active=1 WHERE user_id=?", (user_id,))
+    app_module.user_cache.invalidate(user_id=user_id)
+    assert client.get('/dashboard').status_code == 302
+
+
+def test_role_change_applies_to_existing_session(app_module, student):
+    user_id, client = student
+    assert client.get('/departments/add').status_code == 302       # student - access denied
+    app_module.db.execute_query("UPDATE users SET role='admin' WHERE user_id=?", (user_id,))
+    app_module.user_cache.invalidate(user_id=user_id)
+    assert client.get('/departments/add').status_code == 200
+
+
+class CountingDb:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_one(self, query, params):
+        self.calls += 1
+        return {'user_id': params[0], 'username': 'u', 'role': 'student', 'is_active': 1}
+
+
+def test_user_cache_hit_and_ttl(monkeypatch):
+    db = CountingDb()
+    cache = UserCache(db, ttl=60)
+    cache.get_by_id(1)
+    cache.get_by_id(1)
+    assert db.calls == 1
+    now = time.time()
+    monkeypatch.setattr('auth.time.time', lambda: now + 61)
+    cache.get_by_id(1)
+    assert db.calls == 2
@@ -0,0 +1,89 @@
+import pytest
+
+from cdc import CDC_COLUMNS, fetch_changes, compact_changes
+from storage import Database, hash_password
+
+
+@pytest.fixture
+def db(tmp_path):
+    return Database(str(tmp_path / 'u.db'))
+
+
+def add_student(db, n):
+    return db.execute_query("""
+        INSERT INTO students (enrollment_no, first_name, last_name, email, phone, dob,
+                              dept_id, semester, admission_year)
+        VALUES (?,?,?,?,?,?,1,1,2026)
+    """, (f"E{n:03d}", 'Stu', str(n), f"s{n}@x.in", '99999', '2005-01-01'))
+
+
+def log(db):
+    return [(c['table_name'], c['op'], c['row_id'])
+            for c in db.fetch_all("SELECT * FROM change_log ORDER BY seq")]
+
+
+def test_triggers_log_insert_update_delete(db):
+    sid = add_student(db, 1)
+    db.execute_query("UPDATE students SET semester=2 WHERE student_id=?", (sid,))
+    db.execute_query("DELETE FROM students WHERE student_id=?", (sid,))
+    assert log(db) == [('students', 'INSERT', sid), ('students', 'UPDATE', sid),
+                       ('students', 'DELETE', sid)]
+
+
+def test_cascade_delete_logs_children(db):
+    sid = add_student(db, 1)
+    cid = db.execute_query(
+        "INSERT INTO courses (course_name, course_code, credits, dept_id, semester) VALUES ('C', 'C1', 3, 1, 1)")
+    eid = db.execute_query(
+        "INSERT INTO enrollments (student_id, course_id, academic_year, semester) VALUES (?,?,'2026-2027',1)",
+        (sid, cid))
+    gid = db.execute_query("INSERT INTO grades (enrollment_id, marks_obtained, grade) VALUES (?,85,'A+')", (eid,))
+    db.execute_query("DELETE FROM students WHERE student_id=?", (sid,))
+    assert log(db)[-3:] == [('grades', 'DELETE', gid), ('enrollments', 'DELETE', eid),
+                            ('students', 'DELETE', sid)]
+
+
+def test_fetch_changes_pages_with_next_and_has_more(db):
+    ids = [add_student(db, n) for n in range(5)]
+    db.execute_query("DELETE FROM students WHERE student_id=?", (ids[0],))
+
+    first = fetch_changes(db, since=0, limit=4)
+    assert [c['id'] for c in first['changes']] == ids[:4]
+    assert first['has_more'] is True
+    # ids[0] baad me delete hua - current state None
+    assert first['changes'][0]['row'] is None
+    assert first['changes'][1]['row']['enrollment_no'] == 'E001'
+
+    second = fetch_changes(db, since=first['next'], limit=4)
+    assert [(c['op'], c['id']) for c in second['changes']] == [('INSERT', ids[4]), ('DELETE', ids[0])]
+    assert second['has_more'] is False
+
+    empty = fetch_changes(db, since=second['next'])
+    assert empty['changes'] == [] and empty['next'] == second['next']
+
+
+def test_rows_only_carry_integration_columns(db):
+    add_student(db, 1)
+    row = fetch_changes(db)['changes'][0]['row']
+    assert set(row) == set(CDC_COLUMNS['students'])
+    assert 'email' not in row and 'phone' not in row and 'dob' not in row
+
+
+def test_compact_keeps_latest_entry_per_row(db):
+    a, b = add_student(db, 1), add_student(db, 2)
+    for sem in (2, 3):
+        db.execute_query("UPDATE students SET semester=? WHERE student_id=?", (sem, a))
+    assert compact_changes(db) == 2
+    assert log(db) == [('students', 'INSERT', b), ('students', 'UPDATE', a)]
+
+
+def test_api_changes_is_admin_only(app_module, client):
+    assert client.get('/api/changes?since=0').status_code == 200
+
+    app_module.db.execute_query(
+        "INSERT INTO users (username, password_hash, role) VALUES ('cdcstudent', ?, 'student')",
+        (hash_password('secret1'),))
+    student = app_module.app.test_client()
+    student.post('/login', data={'username': 'cdcstudent', 'password': 'secret1'})
+    resp = student.get('/api/changes?since=0')
+    assert resp.status_code == 302 and '/dashboard' in resp.headers['Location']
@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+
+import pytest
+
+from groupcommit import GroupCommitWriter
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'gc.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, code TEXT NOT NULL UNIQUE)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+class FlakyLock:
+    """Pehli baar acquire pe OSError - flock fail jaisa"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __enter__(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise OSError("flock failed")
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_mixed_batch_each_caller_gets_own_result(db_path):
+    # max_delay bada - saare submits ek hi batch me aate hain
+    writer = GroupCommitWriter(db_path, max_delay=0.3)
+    codes = ['a', 'b', 'dup', 'c', 'dup', 'd']
+    results = [None] * len(codes)
+    start = threading.Barrier(len(codes))
+
+    def submit(i):
+        start.wait()
+        try:
+            results[i] = writer.submit("INSERT INTO items (code) VALUES (?)", (codes[i],))
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(codes))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    writer.close()
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    ids = [r for r in results if not isinstance(r, Exception)]
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+    assert len(set(ids)) == len(ids) == 5
+
+    conn = sqlite3.connect(db_path)
+    rows = dict(conn.execute("SELECT id, code FROM items").fetchall())
+    conn.close()
+    assert sorted(rows) == sorted(ids)
+    for i, r in enumerate(results):
+        if not isinstance(r, Exception):
+            assert rows[r] == codes[i]
+
+
+def test_bind_error_fails_only_that_caller(db_path):
+    writer = GroupCommitWriter(db_path, max_delay=0.3)
+    params = [('p',), ('q',), (10 ** 30,), ('r',)]      # int too large - OverflowError
+    results = [None] * len(params)
+    start = threading.Barrier(len(params))
+
+    def submit(i):
+        start.wait()
+        try:
+            results[i] = writer.submit("INSERT INTO items (code) VALUES (?)", params[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(params))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    writer.close()
+
+    assert isinstance(results[2], Exception) and 'too large' in str(results[2])
+    assert all(isinstance(r, int) for i, r in enumerate(results) if i != 2)
+    conn = sqlite3.connect(db_path)
+    codes = {c for (c,) in conn.execute("SELECT code FROM items")}
+    conn.close()
+    assert codes == {'p', 'q', 'r'}
+
+
+def test_batch_error_goes_to_every_caller_and_writer_survives(db_path):
+    writer = GroupCommitWriter(db_path, lock=FlakyLock())
+    with pytest.raises(Exception, match="flock failed"):
+        writer.submit("INSERT INTO items (code) VALUES (?)", ('x',))
+    # Writer thread zinda hai - agla write commit hota hai
+    assert writer.submit("INSERT INTO items (code) VALUES (?)", ('y',)) == 1
+    writer.close()
+
+
+def test_submit_after_close_does_not_hang(db_path):
+    writer = GroupCommitWriter(db_path)
+    writer.close()
+    with pytest.raises(Exception, match="not running"):
+        writer.submit("INSERT INTO items (code) VALUES (?)", ('z',))
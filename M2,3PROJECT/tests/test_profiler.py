@@ -0,0 +1,51 @@
+import pytest
+
+import profiler
+from profiler import QueryBudgetExceeded
+
+
+@pytest.fixture
+def budgets(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.profiler, 'budgets', dict(app_module.profiler.budgets))
+    return app_module.profiler.budgets
+
+
+@pytest.mark.parametrize('path', ['/dashboard', '/grades'])
+def test_route_within_budget(client, path):
+    resp = client.get(path)
+    assert resp.status_code == 200
+    assert int(resp.headers['X-Query-Count']) >= 1
+    assert 'queries /' in resp.get_data(as_text=True)     # profiler panel
+
+
+@pytest.mark.parametrize('path, endpoint', [('/dashboard', 'dashboard'), ('/grades', 'grades')])
+def test_budget_exceeded_fails_request(client, budgets, path, endpoint):
+    budgets[endpoint] = {'queries': 0}
+    with pytest.raises(QueryBudgetExceeded, match=endpoint):
+        client.get(path)
+
+
+def test_time_budget_exceeded(client, budgets):
+    budgets['grades'] = {'ms': -1}
+    with pytest.raises(QueryBudgetExceeded, match='ms > budget'):
+        client.get('/grades')
+
+
+def test_concurrent_request_skips_cprofile_but_records_sql(client):
+    # Doosri request profile ho rahi hai - lock pehle se pakda hua
+    assert profiler._cprofile_lock.acquire(blocking=False)
+    try:
+        resp = client.get('/dashboard')
+    finally:
+        profiler._cprofile_lock.release()
+    assert resp.status_code == 200
+    assert int(resp.headers['X-Query-Count']) >= 1
+    assert 'cProfile busy' in resp.get_data(as_text=True)
+
+
+def test_cprofile_lock_released_after_failed_request(client, budgets):
+    budgets['grades'] = {'queries': 0}
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/grades')
+    assert not profiler._cprofile_lock.locked()
+    assert 'cProfile busy' not in client.get('/dashboard').get_data(as_text=True)
@@ -0,0 +1,34 @@
+from ratelimit import TokenBucket, limiter_from_env
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert bucket.take(now=bucket.updated) == 0
+    assert bucket.take(now=bucket.updated) == 0
+    assert bucket.take(now=bucket.updated) == 1
+    assert bucket.take(now=bucket.updated + 1) == 0
+
+
+def test_limiter_from_env(monkeypatch):
+    monkeypatch.setenv('AUTH_IP_RATE', '3')
+    monkeypatch.setenv('AUTH_IP_BURST', '50')
+    limiter = limiter_from_env('AUTH_IP', rate=10, capacity=200)
+    assert (limiter.rate, limiter.capacity) == (3, 50)
+    monkeypatch.setenv('AUTH_IP_RATE', '0')
+    assert limiter_from_env('AUTH_IP', rate=10, capacity=200) is None
+
+
+def test_login_storm_from_one_ip_is_not_capped(app_module):
+    # NAT ke peeche 50 alag students - per-IP bucket unhe nahi rokta
+    client = app_module.app.test_client()
+    for i in range(50):
+        resp = client.post('/login', data={'username': f'storm{i}', 'password': 'x'})
+        assert resp.status_code == 200
+
+
+def test_brute_force_on_one_username_gets_429(app_module):
+    client = app_module.app.test_client()
+    codes = [client.post('/login', data={'username': 'victim', 'password': 'x'}).status_code
+             for _ in range(6)]
+    assert codes[:5] == [200] * 5
+    assert codes[5] == 429
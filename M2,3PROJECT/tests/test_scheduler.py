@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from scheduler import Timetable, TimetableCache
+from storage import Database
+
+YEAR, SEM = '2026-2027', 3
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'tt.db'))
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO courses (course_name, course_code, credits, dept_id, semester) VALUES (?,?,?,1,?)",
+        [(f'Course {n}', f'CS3{n:02d}', 3 + n % 2, SEM) for n in range(7)])
+    conn.executemany(
+        "INSERT INTO faculty (faculty_code, first_name, last_name, email, dept_id) VALUES (?,?,?,?,1)",
+        [(f'F{n}', 'Prof', str(n), f'f{n}@x.in') for n in range(4)])
+    conn.executemany("""
+        INSERT INTO students (enrollment_no, first_name, last_name, email, dept_id, semester, admission_year)
+        VALUES (?,?,?,?,1,?,2025)
+    """, [(f'E{n:03d}', 'Stu', str(n), f's{n}@x.in', SEM) for n in range(200)])
+
+    # Course 1 me 150 students - sabse bada room 120 ka, to do sections banenge
+    rng = random.Random(7)
+    rows = [(sid, 1) for sid in range(1, 151)]
+    for sid in range(1, 201):
+        rows += [(sid, cid) for cid in rng.sample(range(2, 8), 2)]
+    conn.executemany(
+        "INSERT INTO enrollments (student_id, course_id, academic_year, semester) VALUES (?,?,?,?)",
+        [(sid, cid, YEAR, SEM) for sid, cid in rows])
+    # Course 7 abhi kisi ko assign nahi - update_course test ke liye
+    conn.executemany(
+        "INSERT INTO faculty_courses (faculty_id, course_id, academic_year, semester) VALUES (?,?,?,?)",
+        [(1 + c % 4, c, YEAR, SEM) for c in range(1, 7)])
+    conn.commit()
+    conn.close()
+    return db
+
+
+def assert_clash_free(tt):
+    capacity = {r['room_id']: r['capacity'] for r in tt.rooms}
+    by_slot = {}
+    for section in tt.sections:
+        assert len(section.placements) == section.meetings
+        for slot, room in section.placements:
+            assert capacity[room] >= section.size
+            by_slot.setdefault(slot, []).append((section, room))
+    for placed in by_slot.values():
+        faculty = [s.faculty_id for s, _ in placed]
+        rooms = [room for _, room in placed]
+        assert len(set(faculty)) == len(faculty)
+        assert len(set(rooms)) == len(rooms)
+        seen = set()
+        for section, _ in placed:
+            assert not seen & section.students
+            seen |= section.students
+    assert tt.unscheduled == []
+
+
+def test_solver_places_every_meeting_without_clashes(db):
+    tt = Timetable(db, YEAR, SEM)
+    assert [s.size for s in tt.sections if s.course['course_id'] == 1] == [75, 75]
+    assert_clash_free(tt)
+
+
+def test_update_course_swaps_in_clash_free_copy(db):
+    cache = TimetableCache(db)
+    old = cache.get(YEAR, SEM)
+    before = {s.key: list(s.placements) for s in old.sections}
+
+    db.execute_query(
+        "INSERT INTO faculty_courses (faculty_id, course_id, academic_year, semester) VALUES (4, 7, ?, ?)",
+        (YEAR, SEM))
+    cache.update_course(YEAR, SEM, 7)
+    new = cache.get(YEAR, SEM)
+
+    assert new is not old
+    assert {s.key: s.placements for s in old.sections} == before
+    assert (7, 1) in {s.key for s in new.sections}
+    assert_clash_free(new)
@@ -0,0 +1,149 @@
+import os
+import time
+import multiprocessing
+
+import pytest
+
+from auth import SqliteSessionStore
+from scheduler import TimetableCache
+from shared import SharedCache, WriterLock
+from storage import Database
+
+fcntl = pytest.importorskip('fcntl')     # pre-fork workers sirf POSIX pe
+ctx = multiprocessing.get_context('fork')
+
+
+def run_in_child(target, *args):
+    """target(*args, queue) ko forked process me chalao, queue ki value lautao"""
+    q = ctx.Queue()
+    p = ctx.Process(target=target, args=args + (q,))
+    p.start()
+    result = q.get(timeout=15)
+    p.join(15)
+    assert p.exitcode == 0
+    return result
+
+
+# ── WriterLock ───────────────────────────────────
+def _locked_increments(lock_path, counter_path, rounds, q):
+    lock = WriterLock(lock_path)
+    overlaps = 0
+    for _ in range(rounds):
+        with lock:
+            marker = counter_path + '.inside'
+            if os.path.exists(marker):
+                overlaps += 1
+            open(marker, 'w').close()
+            with open(counter_path) as fh:
+                value = int(fh.read())
+            time.sleep(0.001)
+            with open(counter_path, 'w') as fh:
+                fh.write(str(value + 1))
+            os.remove(marker)
+    q.put(overlaps)
+
+
+def test_writer_lock_excludes_other_processes(tmp_path):
+    lock_path = str(tmp_path / 'db.writelock')
+    counter_path = str(tmp_path / 'counter')
+    with open(counter_path, 'w') as fh:
+        fh.write('0')
+    q = ctx.Queue()
+    procs = [ctx.Process(target=_locked_increments, args=(lock_path, counter_path, 50, q))
+             for _ in range(2)]
+    for p in procs:
+        p.start()
+    overlaps = [q.get(timeout=30) for _ in procs]
+    for p in procs:
+        p.join(15)
+        assert p.exitcode == 0
+    assert overlaps == [0, 0]
+    with open(counter_path) as fh:
+        assert int(fh.read()) == 100
+
+
+# ── SharedCache ──────────────────────────────────
+def _cache_get(path, key, q):
+    q.put(SharedCache(path).get(key))
+
+
+def _cache_clear(cache, q):
+    # Parent ka cache object (fork se copy) - connection naya khulna chahiye
+    cache.clear()
+    q.put(cache._local.pid == os.getpid())
+
+
+def test_shared_cache_visible_across_processes(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SharedCache(path)
+    cache.set('stats', {'students': 12}, ttl=60)
+    assert run_in_child(_cache_get, path, 'stats') == {'students': 12}
+
+    assert run_in_child(_cache_clear, cache) is True
+    assert cache.get('stats') is None
+
+
+def _bump(cache, name, q):
+    q.put(cache.bump(name))
+
+
+def test_counters_survive_clear_and_are_shared(tmp_path):
+    cache = SharedCache(str(tmp_path / 'cache.db'))
+    assert cache.counter('timetable') == 0
+    assert run_in_child(_bump, cache, 'timetable') == 1
+    cache.clear()
+    assert cache.counter('timetable') == 1
+
+
+# ── Database.writer after fork ───────────────────
+def _child_write(db, q):
+    q.put(db.execute_query("INSERT INTO departments (dept_name, dept_code) VALUES ('Child', 'CH')"))
+
+
+def test_group_commit_writer_recreated_after_fork(tmp_path):
+    db = Database(str(tmp_path / 'u.db'), group_commit=True)
+    parent_writer = db.writer
+    db.execute_query("INSERT INTO departments (dept_name, dept_code) VALUES ('Parent', 'PA')")
+    # Parent ka writer thread child me nahi hota - child ko apna banana chahiye
+    row_id = run_in_child(_child_write, db)
+    assert row_id is not None
+    assert db.writer is parent_writer
+    names = {r['dept_code'] for r in db.fetch_all("SELECT dept_code FROM departments")}
+    assert {'PA', 'CH'} <= names
+    parent_writer.close()
+
+
+# ── Sessions ─────────────────────────────────────
+def _login(path, q):
+    q.put(SqliteSessionStore(path).create({'user_id': 7, 'username': 'asha', 'role': 'faculty'}))
+
+
+def _lookup_session(path, token, q):
+    q.put(SqliteSessionStore(path).get(token))
+
+
+def test_session_created_in_one_worker_is_valid_in_another(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    store = SqliteSessionStore(path)
+    token = run_in_child(_login, path)
+    assert store.get(token)['username'] == 'asha'
+    store.delete(token)
+    assert run_in_child(_lookup_session, path, token) is None
+
+
+# ── Timetable cache sync ─────────────────────────
+def _assign(db_path, cache_path, q):
+    db = Database(db_path, init=False)
+    TimetableCache(db, shared=SharedCache(cache_path)).invalidate('2026-2027', 1)
+    q.put(True)
+
+
+def test_timetable_rebuilt_after_change_in_other_worker(tmp_path):
+    db_path = str(tmp_path / 'u.db')
+    cache_path = str(tmp_path / 'cache.db')
+    db = Database(db_path)
+    timetables = TimetableCache(db, shared=SharedCache(cache_path))
+    first = timetables.get('2026-2027', 1)
+    assert timetables.get('2026-2027', 1) is first
+    run_in_child(_assign, db_path, cache_path)
+    assert timetables.get('2026-2027', 1) is not first